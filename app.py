@@ -1,12 +1,32 @@
-import re
+import uuid
 import pandas as pd
 import streamlit as st
-import requests
-from bs4 import BeautifulSoup
-from datetime import datetime, timezone
-from urllib.parse import urlparse, parse_qs
-from google_play_scraper import reviews, Sort
-from google_play_scraper import app as gp_app
+from datetime import datetime
+from review_table import review_table, filtered_export
+from themes import THEME_KEYWORDS, theme_counts
+from rating_alerts import recent_alerts
+from change_feed import append_new_reviews
+from app_metadata import get_google_app_info, get_apple_app_info, get_rating_summaries, start_background_prefetch
+from dataset_manager import get_dataset, put_dataset, dataset_rows
+from review_archive import UNDATED_STORES, archive_reviews, query_archive
+from store_fetch import STORE_LABELS, fetch_storefronts, fetch_store, fetch_all_stores, combine_store_frames
+from exports import EXPORT_FORMATS, iter_combined_chunks, write_export, export_file_name, export_mime
+from stores import (
+    COUNTRY_NAMES,
+    CATEGORIES,
+    GOOGLE_APPS,
+    APPLE_APPS,
+    MICROSOFT_APPS,
+    AMAZON_APPS,
+    app_identities,
+    star_counts,
+    apply_filters,
+    parse_date_range,
+    package_from_play_url,
+    apple_app_id_from_url,
+    microsoft_product_id_from_url,
+    amazon_asin_from_url,
+)
 
 
 import streamlit as st
@@ -56,153 +76,6 @@ def login_screen():
 #             st.session_state["logged_in"] = False
 #             st.rerun()
 
-# ==========================================================
-# SETTINGS
-# ==========================================================
-
-MAX_STOREFRONTS = None  # None = FULL all storefronts, or set 20 for faster testing
-
-
-# ==========================================================
-# LANGUAGE + COUNTRY HELPERS
-# ==========================================================
-
-LANGUAGE_NAMES = {
-    "en": "English",
-    "es": "Spanish",
-    "fr": "French",
-    "de": "German",
-    "it": "Italian",
-    "pt": "Portuguese",
-    "nl": "Dutch",
-    "ja": "Japanese",
-    "ko": "Korean",
-    "ru": "Russian",
-    "ar": "Arabic",
-    "tr": "Turkish",
-    "zh": "Chinese",
-    "hi": "Hindi",
-    "sv": "Swedish",
-    "da": "Danish",
-    "no": "Norwegian",
-    "fi": "Finnish",
-    "bn": "Bangla",
-    "uk": "Ukrainian",
-    "vi": "Vietnamese",
-    "id": "Indonesian",
-    "ms": "Malay",
-    "sw": "Swahili",
-    "iw": "Hebrew",
-    "cs": "Czech",
-    "sk": "Slovak",
-    "hu": "Hungarian",
-    "ro": "Romanian",
-    "bg": "Bulgarian",
-    "si": "Sinhala",
-    "ne": "Nepali",
-}
-
-COUNTRY_NAMES = {
-    "us": "United States",
-    "ca": "Canada",
-    "mx": "Mexico",
-    "gb": "United Kingdom",
-    "ie": "Ireland",
-    "fr": "France",
-    "de": "Germany",
-    "it": "Italy",
-    "es": "Spain",
-    "pt": "Portugal",
-    "nl": "Netherlands",
-    "be": "Belgium",
-    "ch": "Switzerland",
-    "at": "Austria",
-    "se": "Sweden",
-    "no": "Norway",
-    "fi": "Finland",
-    "dk": "Denmark",
-    "pl": "Poland",
-    "cz": "Czech Republic",
-    "sk": "Slovakia",
-    "hu": "Hungary",
-    "ro": "Romania",
-    "bg": "Bulgaria",
-    "ua": "Ukraine",
-    "ru": "Russia",
-    "in": "India",
-    "pk": "Pakistan",
-    "bd": "Bangladesh",
-    "np": "Nepal",
-    "lk": "Sri Lanka",
-    "id": "Indonesia",
-    "ph": "Philippines",
-    "vn": "Vietnam",
-    "th": "Thailand",
-    "my": "Malaysia",
-    "sg": "Singapore",
-    "jp": "Japan",
-    "kr": "South Korea",
-    "tw": "Taiwan",
-    "hk": "Hong Kong",
-    "tr": "Turkey",
-    "sa": "Saudi Arabia",
-    "ae": "United Arab Emirates",
-    "eg": "Egypt",
-    "il": "Israel",
-    "za": "South Africa",
-    "ng": "Nigeria",
-    "ke": "Kenya",
-    "br": "Brazil",
-    "ar": "Argentina",
-    "cl": "Chile",
-    "co": "Colombia",
-    "pe": "Peru",
-    "au": "Australia",
-    "nz": "New Zealand",
-}
-
-
-def lang_full_name(code: str) -> str:
-    if not code:
-        return ""
-    code = code.split("-")[0].lower().strip()
-    return LANGUAGE_NAMES.get(code, code)
-
-
-def country_full_name(code: str) -> str:
-    if not code:
-        return ""
-    code = code.lower().strip()
-    return COUNTRY_NAMES.get(code, code.upper())
-
-
-# ==========================================================
-# APP INFO (ICON + TITLE)
-# ==========================================================
-
-@st.cache_data(show_spinner=False)
-def get_google_app_info(package_name: str):
-    try:
-        data = gp_app(package_name, lang="en", country="us")
-        return {"title": data.get("title", package_name), "icon": data.get("icon", "")}
-    except Exception:
-        return {"title": package_name, "icon": ""}
-
-
-@st.cache_data(show_spinner=False)
-def get_apple_app_info(app_id: str):
-    try:
-        url = f"https://itunes.apple.com/lookup?id={app_id}"
-        resp = requests.get(url, timeout=15).json()
-        results = resp.get("results", [])
-        if results:
-            r = results[0]
-            return {"title": r.get("trackName", app_id), "icon": r.get("artworkUrl100", "")}
-        return {"title": app_id, "icon": ""}
-    except Exception:
-        return {"title": app_id, "icon": ""}
-
-
 # ==========================================================
 # UI + COMMON HELPERS
 # ==========================================================
@@ -236,9 +109,9 @@ def inject_css():
         div[data-baseweb="select"] > div { border-radius: 12px !important; }
         [data-testid="stMetricLabel"] p { font-weight: 850; }
 
-        /* PREMIUM TABS */
-        div[data-testid="stTabs"] { margin-top: 8px; }
-        button[data-baseweb="tab"] {
+        /* PREMIUM TABS (store selector) */
+        div.st-key-active_view { margin-top: 8px; }
+        div.st-key-active_view label[data-baseweb="radio"] {
             font-weight: 900;
             font-size: 14px;
             border-radius: 999px !important;
@@ -246,10 +119,11 @@ def inject_css():
             margin-right: 8px !important;
             background: rgba(0,0,0,0.04) !important;
         }
-        button[data-baseweb="tab"][aria-selected="true"] {
+        div.st-key-active_view label[data-baseweb="radio"]:has(input:checked) {
             background: rgba(255, 0, 0, 0.12) !important;
             border: 1px solid rgba(255, 0, 0, 0.25) !important;
         }
+        div.st-key-active_view label[data-baseweb="radio"] > div:first-child { display: none; }
         </style>
         """,
         unsafe_allow_html=True,
@@ -268,18 +142,17 @@ def style_by_star_background(styler):
     return styler.apply(row_style, axis=1)
 
 
-def star_counts(df: pd.DataFrame):
-    counts = {s: 0 for s in [1, 2, 3, 4, 5]}
-    if df.empty or "Star" not in df.columns:
-        return counts
-    vc = df["Star"].value_counts(dropna=False).to_dict()
-    for s in counts.keys():
-        counts[s] = int(vc.get(s, 0))
-    return counts
+def session_id() -> str:
+    if "dataset_session_id" not in st.session_state:
+        st.session_state["dataset_session_id"] = uuid.uuid4().hex
+    return st.session_state["dataset_session_id"]
 
 
 def show_star_metrics(df: pd.DataFrame):
-    counts = star_counts(df)
+    show_star_count_metrics(star_counts(df))
+
+
+def show_star_count_metrics(counts):
     m1, m2, m3, m4, m5 = st.columns(5)
     m1.metric("⭐ 1 Star", counts[1])
     m2.metric("⭐ 2 Star", counts[2])
@@ -288,374 +161,59 @@ def show_star_metrics(df: pd.DataFrame):
     m5.metric("⭐ 5 Star", counts[5])
 
 
-def apply_filters(df: pd.DataFrame, star_filter, search_text: str):
-    filtered = df.copy()
-    if filtered.empty:
-        return filtered
-
-    if "Star" in filtered.columns and star_filter:
-        filtered = filtered[filtered["Star"].isin(star_filter)]
-
-    q = (search_text or "").strip().lower()
-    if q:
-        note = filtered.get("Review Note", pd.Series([""] * len(filtered))).fillna("").astype(str).str.lower()
-        filtered = filtered[note.str.contains(re.escape(q), regex=True)]
+def show_rating_overview(summaries):
+    rated = [s for s in summaries if s.get("ratings")]
+    total_ratings = sum(int(s["ratings"]) for s in rated)
+    average = sum(float(s["score"] or 0) * int(s["ratings"]) for s in rated) / total_ratings if total_ratings else 0
 
-    return filtered
+    a1, a2, a3 = st.columns(3)
+    a1.metric("Average rating", f"{average:.2f} ⭐" if total_ratings else "–")
+    a2.metric("Total ratings", f"{total_ratings:,}")
+    a3.metric("Apps", len(summaries))
 
+    # Apple lookup has no per-star histogram
+    if any(v is not None for s in summaries for v in s["stars"].values()):
+        show_star_count_metrics({star: sum(int(s["stars"][star] or 0) for s in summaries) for star in [1, 2, 3, 4, 5]})
 
-def parse_date_range(date_range):
-    def flatten_once(x):
-        if isinstance(x, (list, tuple)) and len(x) == 1 and isinstance(x[0], (list, tuple)):
-            return x[0]
-        return x
-
-    prev = None
-    while prev != date_range:
-        prev = date_range
-        date_range = flatten_once(date_range)
-
-    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
-        start_date, end_date = date_range
-    else:
-        start_date = date_range
-        end_date = date_range
-
-    while isinstance(start_date, (list, tuple)):
-        start_date = start_date[0]
-    while isinstance(end_date, (list, tuple)):
-        end_date = end_date[-1]
-
-    start_dt = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-    end_dt = datetime.combine(end_date, datetime.max.time()).replace(tzinfo=timezone.utc)
-
-    start_label = start_date.strftime("%d %B, %Y")
-    end_label = end_date.strftime("%d %B, %Y")
-    days_selected = (end_date - start_date).days + 1
-    range_label = f"{start_label} - {end_label}"
-
-    return start_dt, end_dt, range_label, days_selected
-
-
-def format_datetime(dt: datetime) -> str:
-    if not dt:
-        return ""
-    dt_local = dt.astimezone(timezone.utc)
-    date_part = dt_local.strftime("%d %B, %Y")
-    time_part = dt_local.strftime("%I:%M %p").lstrip("0")
-    return f"{date_part} - {time_part}"
-
-
-def standardize_table(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return df
-
-    for col in ["User Name", "Review Note", "Star", "App Version", "Device Language", "Country", "dt_utc"]:
-        if col not in df.columns:
-            df[col] = ""
-
-    df["Date & Time"] = df["dt_utc"].apply(format_datetime)
-    df = df.sort_values("dt_utc", ascending=False).reset_index(drop=True)
-
-    final_cols = [
-        "Date & Time",
-        "User Name",
-        "Review Note",
-        "Star",
-        "App Version",
-        "Device Language",
-        "Country",
-    ]
-    return df[final_cols]
-
-
-# ==========================================================
-# GLOBAL CATEGORY + APP LISTS
-# ==========================================================
-
-CATEGORIES = ["Kids Games", "Parents Games", "Applications"]
-
-GOOGLE_APPS = {
-    "Kids Games": {
-            "ABC Kids: Tracing & Phonics": "com.rvappstudios.abc_kids_toddler_tracing_phonics",
-            "Spelling & Phonics: Kids Games": "com.rvappstudios.abc.spelling.toddler.spell.phonics",
-            "123 Numbers - Count & Tracing": "com.rvappstudios.numbers123.toddler.counting.tracing",
-            "Puzzle Kids: Jigsaw Puzzles": "com.rvappstudios.jigsaw.puzzles.kids",
-            "Math Kids: Math Games For Kids": "com.rvappstudios.math.kids.counting",
-            "Color Kids: Coloring Games": "com.rvappstudios.shapes.colors.toddler",
-            "Kids Multiplication Math Games": "com.rvappstudios.kids.multiplication.games.multiply.math",
-            "Baby Games: Piano & Baby Phone": "com.rvappstudios.baby.games.piano.phone.kids",
-            "Coloring Games: Color & Paint": "com.rvappstudios.kids.coloring.book.color.painting",
-            "Learn to Read: Kids Games": "com.rvappstudios.sight.words.phonics.reading.kids.games",
-            "Math Games: Math for Kids": "com.rvappstudios.math.games.kids.addition.subtraction.multiplication.division",
-            "Kids Math: Math Games for Kids": "com.rvappstudios.montessori.math.games.kids.number.counting",
-            "Drawing Games: Draw & Color": "com.rvappstudios.kids.drawing.games.coloring.book.paint",
-            "Kids Games: For Toddlers 3-5": "com.rvappstudios.baby.toddler.kids.games.learning.activity",
-            "Kids Toddler & Preschool Games": "com.rvappstudios.toddler.preschool.kids.learning.games",
-            "Baby Phone & Kids Games": "com.rvappstudios.baby.phone.kids.games.toddler.learning.apps.lucas.and.friends",
-            "Kids Music: Piano, Xylo, Drums": "com.rvappstudios.kids.games.music.baby.piano.songs.lucas.and.friends",
-    },
-    "Parents Games": {
-"Balloon Pop: Match 3 Games": "com.rvappstudios.match3_balloon_puzzle_game",
-"Basketball Games: Hoop Puzzles": "com.rvappstudios.basketball",
-"Block Puzzle: Block Games": "com.rvappstudios.block.jigsaw.puzzle.game.hexa.color",
-"Block Puzzles: Hexa Block Game": "com.rvappstudios.block.puzzle.games.classic.board",
-"Bloody Monsters: Bouncy Bullet": "com.rvappstudios.bloodymonsters",
-"Bubble Crusher: Bubble Pop": "com.rvappstudios.bubblecrusher2",
-"Bubble Pop: Bubble Shooter": "com.rvappstudios.bubble.shooter.shoot.bubbles",
-"Bubble Shooter: Pastry Pop": "com.rvappstudios.bubble.pop.bubble.shooter.puzzle.game.match3",
-"Cake Blast: Match 3 Games": "com.rvappstudios.cake.match3.puzzle.game",
-"Christmas Cookie: Match 3 Game": "com.rvappstudios.christmascookie",
-"Dice Puzzle - Dice Merge Game": "com.rvappstudios.dice.games.merge.puzzle",
-"Find The Difference: Find It": "com.rvappstudios.find.odd.one.out.spot.puzzle.game",
-"Find The Differences - Spot it": "com.rvappstudios.puzzle.game.find.difference.ftd",
-"Finger Slayer": "com.rvappstudios.fingerslayer",
-"Fruit Cube Blast": "com.rvappstudios.tap.blast.match3.puzzle",
-"Gummy Paradise: Match 3 Games": "com.rvappstudios.gummy.paradise.drag.match",
-"Ice Cream Paradise: Match 3": "com.rvappstudios.ice.cream.paradise.match3",
-"Jewel Gems: Jewel Games": "com.rvappstudios.jewel.gem.tap.cube.blast.puzzle.match3.game",
-"Jigsaw Puzzles Blocks": "com.rvappstudios.tangram.jigsaw.puzzles.block.game",
-"Jigsaw Puzzles Hexa": "com.rvappstudios.hexa.jigsaw.puzzle.block.game",
-"Jigsaw Puzzles: Picture Puzzle": "com.rvappstudios.jigsaw.puzzles",
-"Match Tiles: Block Puzzle Game": "com.rvappstudios.tile.match3.block.puzzle.game",
-"Maze Games: Labyrinth Puzzles": "com.rvappstudios.maze.games.puzzle.mazes.labyrinth",
-"Onnet Connect: Tile Matching": "com.rvappstudios.tile.connect.link.puzzle.game",
-"Puzzles: Jigsaw Puzzle Games": "com.rvappstudios.jigsaw.puzzles.picture.block.games",
-"Tangram Puzzle: Polygrams Game": "com.rvappstudios.tangram.blocks.puzzle.brain.games",
-"Tile Puzzle Game: Tiles Match": "com.rvappstudios.tile.match.tiles.puzzle.game",
-"Veggies Cut: Logic Puzzle Game": "com.rvappstudios.veggies.cut.logic.puzzle.adult.game",
-"Word Pics - Word Games": "com.rvappstudios.two.pics.one.word.puzzle.game",
-"Word Puzzle: Word Games": "com.rvappstudios.four.pics.one.word.pic.to.words.puzzle.game",
-"Word Search Games: Word Find": "com.rvappstudios.word.search.puzzle.game",
-"Word Spin: Word Games": "com.rvappstudios.pic.word.games.guess.picture.puzzle",
-"Zombie Heroes: Zombie Games": "com.rvappstudios.lastheroes",
-"Zombie Ragdoll - Zombie Games": "com.rvappstudios.zombieragdoll",
-"Zombie Shooting: Archery Games": "com.rvappstudios.archeryblitz1",
-"Zombie Slice: Zombie Games": "com.rvappstudios.zombiecarnage",
-},
-    "Applications": {
-"Alarm Clock: Mornings & Naps": "com.rvappstudios.alarm.clock.smart.sleep.timer.music",
-"App Locker: Privacy Apps Lock": "com.rvappstudios.applock.protect.lock.app",
-"Digital Compass: Map & GPS": "com.rvappstudios.compass.offline.direction",
-"Flash Alerts LED - Call, SMS": "com.rvappstudios.Flash.Alerts.LED.Call.SMS.Flashlight",
-"Flashlight: Torch Light": "com.rvappstudios.flashlight",
-"Kids App Lock: Parental Lock": "com.rvappstudios.child.lock.kids.parental.control.free",
-"Magnifying Glass + Flashlight": "com.rvappstudios.magnifyingglass",
-"Mirror: Beauty Camera": "com.rvappstudios.mirror",
-"QR Scanner and Generator": "com.rvappstudios.qr.barcode.scanner.reader.generator",
-"Sleep Timer: Turn Music Off": "com.rvappstudios.sleep.timer.off.music.relax",
-"Smart Calc: Daily Calculator": "com.rvappstudios.calculator.free.app",
-"Stopwatch and Timer": "com.rvappstudios.timer.multiple.alarm.stopwatch",
-    }
-}
-
-APPLE_APPS = {
-    "Kids Games": {
-        "ABC Kids: Tracing & Phonics": "1112482869",
-        "Spelling & Phonics: Kids Games": "1186728253",
-        "123 Numbers - Count & Tracing": "1210356444",
-        "Puzzle Kids: Jigsaw Puzzles": "1244400052",
-        "Math Kids: Math Games For Kids": "1272098657",
-        "Color Kids: Coloring Games": "1272085786",
-        "Kids Multiplication Math Games": "1455322707",
-        "Baby Games: Piano & Baby Phone": "1455967837",
-        "Coloring Games: Color & Paint": "1480696573",
-        "Learn to Read: Kids Games": "1498466300",
-        "Math Games: Math for Kids": "1525694602",
-        "Kids Math: Math Games for Kids": "1565484251",
-        "Drawing Games: Draw & Color": "1547228861",
-        "Kids Games: For Toddlers 3-5": "1613310657",
-        "Kids Toddler & Preschool Games": "6472886437",
-        "Baby Phone & Kids Games": "id6744884306",
-        "Kids Music: Piano, Xylo, Drums": "6747074172",
-    },
-    "Parents Games": {
-        "Jigsaw Puzzles: Photo Puzzles": "1440151043",
-        "Find The Differences: Spot It": "1475757108",
-    },
-    "Applications": {
-        "Best Flash Light - Flashlight": "429177928",
-        "Magnifying Glass + Flashlight": "908717824",
-        "Alarm Clock ◎": "450993079",
-    }
-}
+    if len(summaries) > 1:
+        table = pd.DataFrame([
+            {
+                "App": s["title"],
+                "Average": round(float(s["score"]), 2) if s["score"] else None,
+                "Ratings": s["ratings"],
+                **{f"{star} Star": s["stars"][star] for star in [1, 2, 3, 4, 5]},
+            }
+            for s in summaries
+        ])
+        st.dataframe(table, use_container_width=True, hide_index=True)
 
-MICROSOFT_APPS = {
-    "Kids Games": {
-        "Coloring Games (Microsoft Store)": "9phq2rx60xgr",
-    },
-    "Parents Games": {},
-    "Applications": {}
-}
 
-AMAZON_APPS = {
-    "Kids Games": {
-        "Coloring Games (Amazon)": "B08156J9VN",
-    },
-    "Parents Games": {},
-    "Applications": {}
-}
-
-
-# ==========================================================
-# FULL STOREFRONTS LIST (60+)
-# ==========================================================
-
-GOOGLE_ALL_STOREFRONTS = [
-    ("us", "en", "United States"),
-    ("ca", "en", "Canada"),
-    ("mx", "es", "Mexico"),
-    ("gb", "en", "United Kingdom"),
-    ("ie", "en", "Ireland"),
-    ("fr", "fr", "France"),
-    ("de", "de", "Germany"),
-    ("it", "it", "Italy"),
-    ("es", "es", "Spain"),
-    ("pt", "pt", "Portugal"),
-    ("nl", "nl", "Netherlands"),
-    ("be", "fr", "Belgium"),
-    ("ch", "de", "Switzerland"),
-    ("at", "de", "Austria"),
-    ("se", "sv", "Sweden"),
-    ("no", "no", "Norway"),
-    ("fi", "fi", "Finland"),
-    ("dk", "da", "Denmark"),
-    ("pl", "pl", "Poland"),
-    ("cz", "cs", "Czech Republic"),
-    ("sk", "sk", "Slovakia"),
-    ("hu", "hu", "Hungary"),
-    ("ro", "ro", "Romania"),
-    ("bg", "bg", "Bulgaria"),
-    ("ua", "uk", "Ukraine"),
-    ("ru", "ru", "Russia"),
-    ("in", "en", "India"),
-    ("pk", "en", "Pakistan"),
-    ("bd", "bn", "Bangladesh"),
-    ("np", "ne", "Nepal"),
-    ("lk", "si", "Sri Lanka"),
-    ("id", "id", "Indonesia"),
-    ("ph", "en", "Philippines"),
-    ("vn", "vi", "Vietnam"),
-    ("th", "th", "Thailand"),
-    ("my", "ms", "Malaysia"),
-    ("sg", "en", "Singapore"),
-    ("jp", "ja", "Japan"),
-    ("kr", "ko", "South Korea"),
-    ("tw", "zh", "Taiwan"),
-    ("hk", "zh", "Hong Kong"),
-    ("tr", "tr", "Turkey"),
-    ("sa", "ar", "Saudi Arabia"),
-    ("ae", "ar", "United Arab Emirates"),
-    ("eg", "ar", "Egypt"),
-    ("il", "iw", "Israel"),
-    ("za", "en", "South Africa"),
-    ("ng", "en", "Nigeria"),
-    ("ke", "sw", "Kenya"),
-    ("br", "pt", "Brazil"),
-    ("ar", "es", "Argentina"),
-    ("cl", "es", "Chile"),
-    ("co", "es", "Colombia"),
-    ("pe", "es", "Peru"),
-    ("au", "en", "Australia"),
-    ("nz", "en", "New Zealand"),
-]
-
-APPLE_COUNTRIES = [c for c, _, _ in GOOGLE_ALL_STOREFRONTS]
+def show_theme_metrics(df: pd.DataFrame):
+    counts = theme_counts(df)
+    cols = st.columns(len(counts))
+    for col, (theme, count) in zip(cols, counts.items()):
+        col.metric(theme, count)
 
 
 # ==========================================================
 # GOOGLE PLAY FUNCTIONS
 # ==========================================================
 
-def package_from_play_url(play_url: str) -> str:
-    qs = parse_qs(urlparse(play_url).query)
-    if "id" in qs and qs["id"]:
-        return qs["id"][0]
-    m = re.search(r"[?&]id=([^&]+)", play_url)
-    if m:
-        return m.group(1)
-    raise ValueError("Could not find package id in URL. Must include ?id=com.example.app")
-
-
-def fetch_google_reviews_date_range(package_name: str, start_dt: datetime, end_dt: datetime, lang: str, country: str, max_pages: int = 50):
-    rows = []
-    token = None
-    pages = 0
-
-    while pages < max_pages:
-        result, token = reviews(
-            package_name,
-            lang=lang,
-            country=country,
-            sort=Sort.NEWEST,
-            count=200,
-            continuation_token=token,
-        )
-        pages += 1
-
-        if not result:
-            break
-
-        stop = False
-        for r in result:
-            at = r.get("at")
-            if not at:
-                continue
-
-            at = at.replace(tzinfo=timezone.utc) if at.tzinfo is None else at.astimezone(timezone.utc)
-
-            if at < start_dt:
-                stop = True
-                continue
-            if at > end_dt:
-                continue
-
-            rows.append(
-                {
-                    "dt_utc": at,
-                    "User Name": r.get("userName") or "",
-                    "Review Note": r.get("content") or "",
-                    "Star": r.get("score"),
-                    "App Version": r.get("reviewCreatedVersion") or "",
-                    "Device Language": lang_full_name(lang),
-                    "Country": country_full_name(country),
-                }
-            )
-
-        if stop or token is None:
-            break
-
-    return pd.DataFrame(rows)
-
-
 def fetch_google_all_countries(package_name: str, start_dt: datetime, end_dt: datetime):
-    frames = []
-    storefronts = GOOGLE_ALL_STOREFRONTS[:MAX_STOREFRONTS] if MAX_STOREFRONTS else GOOGLE_ALL_STOREFRONTS
-    total = len(storefronts)
-
-    status_box = st.status("Collecting Google Play reviews...", expanded=False)
+    status_box = st.status("Checking which Google Play storefronts have new reviews...", expanded=False)
     progress = st.progress(0)
 
-    for i, (country_code, lang_code, country_name) in enumerate(storefronts, start=1):
-        status_box.update(label=f"Google: {country_name} • {i}/{total}")
+    def on_progress(i, total, country_name, skipped):
+        status_box.update(label=f"Google: {country_name} • {i}/{total} ({skipped} empty storefronts skipped)")
         progress.progress(int((i / total) * 100))
 
-        try:
-            df = fetch_google_reviews_date_range(package_name, start_dt, end_dt, lang_code, country_code)
-            if not df.empty:
-                frames.append(df)
-        except Exception:
-            continue
-
+    combined = fetch_storefronts("google", package_name, start_dt, end_dt, on_progress)
     progress.progress(100)
-    status_box.update(label="Merging Google results…", state="running")
 
-    if not frames:
+    if combined.empty:
         status_box.update(label="Done (no reviews).", state="complete")
-        return pd.DataFrame()
+        return combined
 
-    combined = pd.concat(frames, ignore_index=True)
-    combined = combined.drop_duplicates(subset=["User Name", "dt_utc", "Review Note"], keep="first")
     status_box.update(label=f"Done. Merged {len(combined)} unique Google reviews.", state="complete")
     return combined
 
@@ -664,210 +222,25 @@ def fetch_google_all_countries(package_name: str, start_dt: datetime, end_dt: da
 # APPLE FUNCTIONS
 # ==========================================================
 
-def apple_app_id_from_url(url: str) -> str:
-    m = re.search(r"/id(\d+)", url)
-    if not m:
-        raise ValueError("Could not find Apple App ID. URL must include /id123456789")
-    return m.group(1)
-
-
-def fetch_apple_reviews_country(app_id: str, country: str, start_dt: datetime, end_dt: datetime, max_pages: int = 10):
-    rows = []
-    for page in range(1, max_pages + 1):
-        url = f"https://itunes.apple.com/{country}/rss/customerreviews/page={page}/id={app_id}/sortby=mostrecent/json"
-
-        try:
-            resp = requests.get(url, timeout=20)
-            if resp.status_code != 200:
-                break
-            data = resp.json()
-        except Exception:
-            break
-
-        entries = data.get("feed", {}).get("entry", [])
-        if not entries or len(entries) <= 1:
-            break
-
-        for e in entries:
-            if "author" not in e or "im:rating" not in e:
-                continue
-
-            updated = e.get("updated", {}).get("label", "")
-            try:
-                at = pd.to_datetime(updated, utc=True).to_pydatetime()
-            except Exception:
-                continue
-
-            at = at.replace(tzinfo=timezone.utc) if at.tzinfo is None else at.astimezone(timezone.utc)
-
-            if at < start_dt:
-                return pd.DataFrame(rows)
-            if at > end_dt:
-                continue
-
-            title = e.get("title", {}).get("label", "") or ""
-            note = e.get("content", {}).get("label", "") or ""
-            merged_note = f"{title}\n\n{note}".strip() if title else note
-
-            rows.append(
-                {
-                    "dt_utc": at,
-                    "User Name": e.get("author", {}).get("name", {}).get("label", "") or "",
-                    "Review Note": merged_note,
-                    "Star": int(e.get("im:rating", {}).get("label", 0)),
-                    "App Version": e.get("im:version", {}).get("label", "") or "",
-                    "Device Language": "",
-                    "Country": country_full_name(country),
-                }
-            )
-
-    return pd.DataFrame(rows)
-
-
 def fetch_apple_all_countries(app_id: str, start_dt: datetime, end_dt: datetime):
-    frames = []
-    storefronts = APPLE_COUNTRIES[:MAX_STOREFRONTS] if MAX_STOREFRONTS else APPLE_COUNTRIES
-    total = len(storefronts)
-
-    status_box = st.status("Collecting Apple reviews...", expanded=False)
+    status_box = st.status("Checking which Apple storefronts have new reviews...", expanded=False)
     progress = st.progress(0)
 
-    for i, c in enumerate(storefronts, start=1):
-        status_box.update(label=f"Apple: {country_full_name(c)} • {i}/{total}")
+    def on_progress(i, total, country_name, skipped):
+        status_box.update(label=f"Apple: {country_name} • {i}/{total} ({skipped} empty storefronts skipped)")
         progress.progress(int((i / total) * 100))
 
-        try:
-            df = fetch_apple_reviews_country(app_id, c, start_dt, end_dt)
-            if not df.empty:
-                frames.append(df)
-        except Exception:
-            continue
-
+    combined = fetch_storefronts("apple", app_id, start_dt, end_dt, on_progress)
     progress.progress(100)
-    status_box.update(label="Merging Apple results…", state="running")
 
-    if not frames:
+    if combined.empty:
         status_box.update(label="Done (no reviews).", state="complete")
-        return pd.DataFrame()
+        return combined
 
-    combined = pd.concat(frames, ignore_index=True)
-    combined = combined.drop_duplicates(subset=["User Name", "dt_utc", "Review Note"], keep="first")
     status_box.update(label=f"Done. Merged {len(combined)} unique Apple reviews.", state="complete")
     return combined
 
 
-# ==========================================================
-# MICROSOFT + AMAZON (best effort)
-# ==========================================================
-
-def microsoft_product_id_from_url(url: str) -> str:
-    m = re.search(r"/detail/([A-Za-z0-9]{6,})", url)
-    if not m:
-        raise ValueError("Could not find Microsoft Product ID. Must include /detail/<id>")
-    return m.group(1)
-
-
-def fetch_microsoft_reviews(product_id: str):
-    rows = []
-    headers = {"User-Agent": "Mozilla/5.0"}
-
-    url = f"https://apps.microsoft.com/detail/{product_id}?hl=en-us&gl=us"
-
-    try:
-        r = requests.get(url, headers=headers, timeout=25)
-        if r.status_code != 200:
-            return pd.DataFrame()
-    except Exception:
-        return pd.DataFrame()
-
-    soup = BeautifulSoup(r.text, "lxml")
-    review_blocks = soup.find_all("div", class_=re.compile("review", re.I))
-
-    for rb in review_blocks:
-        txt = rb.get_text(" ", strip=True)
-        mstar = re.search(r"(\d)\s*out of 5", txt)
-        if not mstar:
-            continue
-        star = int(mstar.group(1))
-
-        rows.append(
-            {
-                "dt_utc": None,
-                "User Name": "",
-                "Review Note": txt,
-                "Star": star,
-                "App Version": "",
-                "Device Language": "",
-                "Country": "United States",
-            }
-        )
-
-    return pd.DataFrame(rows)
-
-
-def amazon_asin_from_url(url: str) -> str:
-    m = re.search(r"/dp/([A-Z0-9]{10})", url)
-    if not m:
-        raise ValueError("Could not find Amazon ASIN. Must include /dp/BXXXXXXXXX")
-    return m.group(1)
-
-
-def fetch_amazon_reviews(asin: str, max_pages: int = 3):
-    rows = []
-    headers = {"User-Agent": "Mozilla/5.0", "Accept-Language": "en-US,en;q=0.9"}
-
-    for page in range(1, max_pages + 1):
-        url = f"https://www.amazon.com/product-reviews/{asin}/?pageNumber={page}"
-
-        try:
-            r = requests.get(url, headers=headers, timeout=25)
-            if r.status_code != 200:
-                break
-        except Exception:
-            break
-
-        if "captcha" in r.text.lower() or "robot check" in r.text.lower():
-            return pd.DataFrame([{
-                "dt_utc": None,
-                "User Name": "",
-                "Review Note": "Amazon blocked the request (captcha/bot check). Use Amazon Product Advertising API for stable results.",
-                "Star": "",
-                "App Version": "",
-                "Device Language": "",
-                "Country": "United States",
-            }])
-
-        soup = BeautifulSoup(r.text, "lxml")
-        blocks = soup.select("div[data-hook='review']")
-        if not blocks:
-            break
-
-        for b in blocks:
-            star_txt = b.select_one("i[data-hook='review-star-rating'] span")
-            star = ""
-            if star_txt:
-                mstar = re.search(r"(\d+(\.\d+)?)", star_txt.get_text(strip=True))
-                if mstar:
-                    star = int(float(mstar.group(1)))
-
-            body = b.select_one("span[data-hook='review-body']")
-            text = body.get_text(" ", strip=True) if body else ""
-
-            rows.append(
-                {
-                    "dt_utc": None,
-                    "User Name": "",
-                    "Review Note": text,
-                    "Star": star,
-                    "App Version": "",
-                    "Device Language": "",
-                    "Country": "United States",
-                }
-            )
-
-    return pd.DataFrame(rows)
-
-
 # ==========================================================
 # APP MAIN UI
 # ==========================================================
@@ -875,6 +248,9 @@ def fetch_amazon_reviews(asin: str, max_pages: int = 3):
 st.set_page_config(page_title="RV AppStudios - Store Reviews Tool", layout="wide")
 inject_css()
 
+# ✅ Warm icon + title cache for every catalog app once per server process
+start_background_prefetch()
+
 if not login_screen():
     st.stop()
 
@@ -882,6 +258,14 @@ st.markdown('<div class="rv-title">RV AppStudios - Store Reviews Tool</div>', un
 # st.markdown('<div class="rv-subtitle">Choose Category and Date Range globally. Then fetch and filter reviews per store.</div>', unsafe_allow_html=True)
 st.markdown('<div class="rv-subtitle"></div>', unsafe_allow_html=True)
 
+# ✅ Star-rating spike alerts written by rating_alerts.py (runs outside Streamlit)
+for alert in recent_alerts():
+    st.warning(
+        f"🚨 {alert['store'].title()} • {alert['app_id']} • {alert['country']}: "
+        f"{alert['low_star_rate']:.0%} 1-2 star reviews in the hour from {alert['hour'][:16].replace('T', ' ')} UTC "
+        f"(baseline {alert['baseline_rate']:.0%}, {alert['reviews']} reviews)"
+    )
+
 
 # Premium Global Filters
 # st.markdown(
@@ -918,12 +302,23 @@ st.markdown(f"###### 📅 **{global_range_label}" f" - Days selected: {global_da
 
 
 # Premium Tabs
-tab_google, tab_apple, tab_microsoft, tab_amazon = st.tabs([
-    "🟢 Google Play",
-    "🍎 Apple App Store",
-    "🪟 Microsoft Store",
-    "🛒 Amazon"
-])
+# st.tabs runs every tab body on each rerun (and would load every session dataset);
+# a selector renders only the active store.
+VIEWS = {
+    "google": "🟢 Google Play",
+    "apple": "🍎 Apple App Store",
+    "microsoft": "🪟 Microsoft Store",
+    "amazon": "🛒 Amazon",
+    "all": "🌐 All Stores",
+}
+active_view = st.radio(
+    "Store",
+    list(VIEWS.keys()),
+    format_func=VIEWS.get,
+    horizontal=True,
+    label_visibility="collapsed",
+    key="active_view",
+)
 
 
 # ==========================================================
@@ -931,7 +326,7 @@ tab_google, tab_apple, tab_microsoft, tab_amazon = st.tabs([
 # ==========================================================
 
 def dashboard_tab(store_label, store_apps_by_category, link_label, link_placeholder, extract_id_fn,
-                  fetch_fn, info_fn, session_key, note=""):
+                  fetch_fn, info_fn, session_key, store_key, note=""):
 
     if note:
         st.caption(note)
@@ -976,6 +371,14 @@ def dashboard_tab(store_label, store_apps_by_category, link_label, link_placehol
             key=f"{session_key}_star_filter"
         )
 
+        country_filter = st.multiselect(
+            "Countries",
+            sorted(COUNTRY_NAMES.values()),
+            default=[],
+            placeholder="All countries",
+            key=f"{session_key}_country_filter"
+        )
+
         search_text = st.text_input(
             "Search keyword",
             value="",
@@ -983,6 +386,20 @@ def dashboard_tab(store_label, store_apps_by_category, link_label, link_placehol
             key=f"{session_key}_search"
         )
 
+        theme_filter = st.multiselect(
+            "Themes",
+            list(THEME_KEYWORDS.keys()),
+            default=[],
+            key=f"{session_key}_theme_filter"
+        )
+
+        collapse_dupes = st.checkbox(
+            "Collapse near-duplicate reviews",
+            value=False,
+            help="Groups copy-paste spam and re-posted reviews. Shown as 'Similar Reviews' when not collapsed.",
+            key=f"{session_key}_collapse_dupes"
+        )
+
     # ✅ Centered Date Range Display (Premium)
     st.markdown(
         f"""
@@ -1005,23 +422,79 @@ def dashboard_tab(store_label, store_apps_by_category, link_label, link_placehol
             use_container_width=True,
             key=f"{session_key}_fetch"
         )
+        archive_clicked = st.button(
+            "🗄️ Load from archive",
+            use_container_width=True,
+            key=f"{session_key}_archive"
+        )
+        archive_whole_category = st.checkbox(
+            f"Archive: all {global_category} apps",
+            value=False,
+            key=f"{session_key}_archive_all"
+        )
     # st.write("")
 
-    st.divider()
+    # ✅ Quick overview: lifetime stars from store metadata, no review fetch needed
+    if store_key in ("google", "apple"):
+        with st.expander("⚡ Quick overview (lifetime ratings from store metadata)"):
+            category_apps = store_apps_by_category.get(global_category, {})
+            scope = st.radio(
+                "Scope",
+                ["Selected app", f"All {global_category} apps"],
+                horizontal=True,
+                key=f"{session_key}_overview_scope"
+            )
+            if st.button("Load overview", key=f"{session_key}_overview_btn"):
+                app_ids = [app_id] if scope == "Selected app" else list(category_apps.values())
+                with st.spinner("Loading ratings..."):
+                    st.session_state[f"{session_key}_overview"] = get_rating_summaries(store_key, app_ids)
+
+            if st.session_state.get(f"{session_key}_overview"):
+                show_rating_overview(st.session_state[f"{session_key}_overview"])
 
-    # --- Session state storage ---
-    if session_key not in st.session_state:
-        st.session_state[session_key] = pd.DataFrame()
+    st.divider()
 
     # --- Fetch and store ---
     if fetch_clicked:
         try:
             with st.spinner(f"Fetching {store_label} reviews..."):
-                st.session_state[session_key] = fetch_fn(app_id, global_start_dt, global_end_dt)
+                put_dataset(session_id(), session_key, fetch_fn(app_id, global_start_dt, global_end_dt))
+            fetched_ok = True
+        except Exception as e:
+            st.error(str(e))
+            fetched_ok = False
+
+        # ✅ Append never-seen reviews to the change feed for downstream tools (failed fetches write nothing)
+        if fetched_ok:
+            try:
+                new_count = append_new_reviews(store_key, app_id, get_dataset(session_id(), session_key))
+                st.caption(f"Change feed: {new_count} new reviews appended.")
+            except Exception as e:
+                st.caption(f"Change feed not updated: {e}")
+
+        # ✅ Keep a copy in the long-term archive
+        if fetched_ok:
+            try:
+                archive_reviews(store_key, app_id, get_dataset(session_id(), session_key))
+            except Exception as e:
+                st.caption(f"Archive not updated: {e}")
+
+    # --- Load a filtered slice from the archive (no network) ---
+    if archive_clicked:
+        archive_app_ids = list(store_apps_by_category.get(global_category, {}).values()) if archive_whole_category else [app_id]
+        try:
+            with st.spinner("Reading archive..."):
+                put_dataset(session_id(), session_key, query_archive(
+                    store_key, archive_app_ids, global_start_dt, global_end_dt,
+                    stars=star_filter, countries=country_filter, search_text=search_text,
+                    include_undated=store_key in UNDATED_STORES,
+                ))
         except Exception as e:
             st.error(str(e))
 
-    raw_df = st.session_state[session_key].copy()
+    # --- Session dataset storage (memory-budgeted, may be spilled to disk) ---
+    raw_df = get_dataset(session_id(), session_key)
+    raw_df = raw_df if raw_df is not None else pd.DataFrame()
 
     # --- App icon + name header after fetch ---
     if not raw_df.empty and info_fn:
@@ -1035,12 +508,15 @@ def dashboard_tab(store_label, store_apps_by_category, link_label, link_placehol
             # st.caption(f"{store_label} • {global_range_label} • Category: {global_category}")
             st.caption(f"{store_label} • {global_range_label}")
     # --- Format + filters ---
-    df = standardize_table(raw_df) if not raw_df.empty else pd.DataFrame()
-    filtered = apply_filters(df, star_filter, search_text)
+    df = review_table(raw_df, collapse_dupes)
+    filtered = apply_filters(df, star_filter, search_text, theme_filter, country_filter)
 
     st.markdown("### Star counts")
     show_star_metrics(df)
 
+    st.markdown("### Themes")
+    show_theme_metrics(df)
+
     # st.write("")
     st.divider()
 
@@ -1049,18 +525,158 @@ def dashboard_tab(store_label, store_apps_by_category, link_label, link_placehol
         st.info("Click Fetch Reviews to load reviews.")
     else:
         st.caption(f"Showing {len(filtered)} of {len(df)} reviews after filters.")
-        st.dataframe(style_by_star_background(filtered.style), use_container_width=True, height=650)
+        st.dataframe(
+            style_by_star_background(filtered.style),
+            use_container_width=True,
+            height=650,
+            column_config={"Review ID": None},
+        )
 
-        st.download_button(
-            "Download CSV (Filtered)",
-            data=filtered.to_csv(index=False).encode("utf-8"),
-            file_name=f"{store_label.lower().replace(' ', '_')}_reviews.csv",
-            mime="text/csv",
+        # ✅ Export is built only when Download is clicked, chunk by chunk
+        exp1, exp2 = st.columns([1, 2])
+        with exp1:
+            export_fmt = st.selectbox("Export format", list(EXPORT_FORMATS.keys()), key=f"{session_key}_export_fmt")
+        with exp2:
+            st.write("")
+            st.download_button(
+                f"Download {export_fmt} (Filtered)",
+                data=lambda: filtered_export(filtered, export_fmt),
+                file_name=export_file_name(f"{store_label.lower().replace(' ', '_')}_reviews", export_fmt),
+                mime=export_mime(export_fmt),
+                use_container_width=True,
+                key=f"{session_key}_download",
+            )
+
+# ==========================================================
+# ALL STORES TAB (one app, every store at once)
+# ==========================================================
+
+def all_stores_tab():
+    st.caption("Fetches every store that lists the app at the same time and merges the results into one table.")
+
+    identities = app_identities(global_category)
+    if not identities:
+        st.warning(f"No apps listed under {global_category}. Add apps in code.")
+        return
+
+    c1, c2 = st.columns([1.55, 1.10], gap="large")
+
+    with c1:
+        st.markdown("#### App Selection")
+        app_label = st.selectbox("Select app", list(identities.keys()), key="all_raw_app")
+        ids_by_store = identities[app_label]
+        st.caption(" • ".join(f"{STORE_LABELS[store]}: {app_id}" for store, app_id in ids_by_store.items()))
+
+    with c2:
+        st.markdown("#### Filters")
+        star_filter = st.multiselect(
+            "Stars",
+            [1, 2, 3, 4, 5],
+            default=[1, 2, 3, 4, 5],
+            key="all_raw_star_filter"
+        )
+
+        store_filter = st.multiselect(
+            "Stores",
+            list(STORE_LABELS.values()),
+            default=[],
+            placeholder="All stores",
+            key="all_raw_store_filter"
+        )
+
+        search_text = st.text_input(
+            "Search keyword",
+            value="",
+            placeholder="crash, ads, language...",
+            key="all_raw_search"
+        )
+
+        theme_filter = st.multiselect(
+            "Themes",
+            list(THEME_KEYWORDS.keys()),
+            default=[],
+            key="all_raw_theme_filter"
+        )
+
+    st.write("")
+    center1, center2, center3 = st.columns([1.6, 2.2, 1.6])
+    with center2:
+        fetch_clicked = st.button(
+            f"🚀 Fetch {len(ids_by_store)} Stores",
+            type="primary",
+            use_container_width=True,
+            key="all_raw_fetch"
+        )
+
+    st.divider()
+
+    # --- All stores at once: the wait is the slowest store ---
+    if fetch_clicked:
+        with st.spinner(f"Fetching {', '.join(STORE_LABELS[s] for s in ids_by_store)} in parallel..."):
+            results, errors = fetch_all_stores(ids_by_store, global_start_dt, global_end_dt)
+        for store, error in errors.items():
+            st.error(f"{STORE_LABELS[store]}: {error}")
+        put_dataset(session_id(), "all_raw", combine_store_frames(results))
+
+        # ✅ Same change feed + archive bookkeeping as the single-store Fetch buttons
+        for store, store_df in results.items():
+            if store in errors:
+                continue
+            try:
+                append_new_reviews(store, ids_by_store[store], store_df)
+                archive_reviews(store, ids_by_store[store], store_df)
+            except Exception as e:
+                st.caption(f"{STORE_LABELS[store]}: change feed / archive not updated: {e}")
+
+    df = review_table(get_dataset(session_id(), "all_raw"))
+    filtered = apply_filters(df, star_filter, search_text, theme_filter)
+    if store_filter and not filtered.empty:
+        filtered = filtered[filtered["Store"].isin(store_filter)]
+
+    st.markdown("### Star counts (all stores)")
+    show_star_metrics(df)
+
+    if not df.empty:
+        per_store = pd.crosstab(df["Store"], pd.to_numeric(df["Star"], errors="coerce"))
+        per_store = per_store.reindex(columns=[1, 2, 3, 4, 5], fill_value=0)
+        per_store.columns = [f"{star} Star" for star in per_store.columns]
+        per_store["Total"] = per_store.sum(axis=1)
+        st.dataframe(per_store, use_container_width=True)
+
+    st.markdown("### Themes")
+    show_theme_metrics(df)
+
+    st.divider()
+
+    st.markdown("### Reviews")
+    if df.empty:
+        st.info("Click Fetch to load reviews from every store at once.")
+    else:
+        st.caption(f"Showing {len(filtered)} of {len(df)} reviews after filters.")
+        st.dataframe(
+            style_by_star_background(filtered.style),
             use_container_width=True,
+            height=650,
+            column_config={"Review ID": None},
         )
 
-# Run tabs
-with tab_google:
+        exp1, exp2 = st.columns([1, 2])
+        with exp1:
+            export_fmt = st.selectbox("Export format", list(EXPORT_FORMATS.keys()), key="all_raw_export_fmt")
+        with exp2:
+            st.write("")
+            st.download_button(
+                f"Download {export_fmt} (Filtered)",
+                data=lambda: filtered_export(filtered, export_fmt),
+                file_name=export_file_name("combined_reviews", export_fmt),
+                mime=export_mime(export_fmt),
+                use_container_width=True,
+                key="all_raw_download",
+            )
+
+
+# Run the active tab only
+if active_view == "google":
     dashboard_tab(
         store_label="Google Play Reviews",
         store_apps_by_category=GOOGLE_APPS,
@@ -1071,9 +687,10 @@ with tab_google:
         fetch_fn=fetch_google_all_countries,
         info_fn=get_google_app_info,
         session_key="google_raw",
+        store_key="google",
     )
 
-with tab_apple:
+elif active_view == "apple":
     dashboard_tab(
         store_label="Apple App Store Reviews",
         store_apps_by_category=APPLE_APPS,
@@ -1084,30 +701,72 @@ with tab_apple:
         fetch_fn=fetch_apple_all_countries,
         info_fn=get_apple_app_info,
         session_key="apple_raw",
+        store_key="apple",
     )
 
-with tab_microsoft:
+elif active_view == "microsoft":
     dashboard_tab(
         store_label="Microsoft Store Reviews (Best Effort)",
         store_apps_by_category=MICROSOFT_APPS,
         link_label="Microsoft Store link",
         link_placeholder="https://apps.microsoft.com/detail/XXXXXXXXXXXX",
         extract_id_fn=microsoft_product_id_from_url,
-        fetch_fn=lambda pid, s, e: fetch_microsoft_reviews(pid),
+        fetch_fn=lambda pid, s, e: fetch_store("microsoft", pid, s, e),
         info_fn=None,
         session_key="ms_raw",
+        store_key="microsoft",
         note="Microsoft does not provide a stable public reviews API. This is best-effort scraping."
     )
 
-with tab_amazon:
+elif active_view == "amazon":
     dashboard_tab(
         store_label="Amazon Reviews (Best Effort)",
         store_apps_by_category=AMAZON_APPS,
         link_label="Amazon link",
         link_placeholder="https://www.amazon.com/dp/BXXXXXXXXX",
         extract_id_fn=amazon_asin_from_url,
-        fetch_fn=lambda asin, s, e: fetch_amazon_reviews(asin),
+        fetch_fn=lambda asin, s, e: fetch_store("amazon", asin, s, e),
         info_fn=None,
         session_key="am_raw",
+        store_key="amazon",
         note="Amazon often blocks scraping (captcha). For stable results, use Amazon Product Advertising API."
     )
+
+else:
+    all_stores_tab()
+
+
+# ==========================================================
+# ALL STORES EXPORT
+# ==========================================================
+
+all_store_keys = {
+    "Google Play": "google_raw",
+    "Apple App Store": "apple_raw",
+    "Microsoft Store": "ms_raw",
+    "Amazon": "am_raw",
+}
+all_stores_session = session_id()
+
+
+def all_store_datasets():
+    # loaded (and un-spilled) only when Download is clicked, not on every rerun
+    return {label: get_dataset(all_stores_session, key) for label, key in all_store_keys.items()}
+
+
+if any(dataset_rows(all_stores_session, key) for key in all_store_keys.values()):
+    st.divider()
+    st.markdown("### Export all stores")
+    all1, all2 = st.columns([1, 2])
+    with all1:
+        all_export_fmt = st.selectbox("Export format", list(EXPORT_FORMATS.keys()), key="all_stores_export_fmt")
+    with all2:
+        st.write("")
+        st.download_button(
+            f"Download {all_export_fmt} (All stores combined)",
+            data=lambda: write_export(iter_combined_chunks(all_store_datasets()), all_export_fmt),
+            file_name=export_file_name("all_stores_reviews", all_export_fmt),
+            mime=export_mime(all_export_fmt),
+            use_container_width=True,
+            key="all_stores_download",
+        )
@@ -0,0 +1,194 @@
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from google_play_scraper import app as gp_app
+
+from stores import DATA_DIR, GOOGLE_APPS, APPLE_APPS
+from shared_cache import SHARED_CACHE_URL, cache_get, cache_set
+
+
+# ==========================================================
+# PERSISTENT APP METADATA + ICON CACHE
+# ==========================================================
+
+METADATA_DIR = os.path.join(DATA_DIR, "metadata")
+ICON_DIR = os.path.join(METADATA_DIR, "icons")
+METADATA_TTL = 7 * 24 * 3600
+RATINGS_TTL = 6 * 3600  # star histograms move faster than titles and icons
+FAILURE_TTL = 5 * 60  # after a failed lookup, serve what we have instead of retrying on every rerun
+PREFETCH_WORKERS = 8
+
+_memory_cache = {}  # (store, app_id) -> entry
+_prefetch_started = False
+_prefetch_lock = threading.Lock()
+
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]", "_", str(value))
+
+
+def _entry_path(store: str, app_id: str) -> str:
+    return os.path.join(METADATA_DIR, store, f"{_safe_name(app_id)}.json")
+
+
+def _tmp_path(path: str) -> str:
+    return f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+
+
+def _fetch_google_info(package_name: str):
+    data = gp_app(package_name, lang="en", country="us")
+    return {
+        "title": data.get("title", package_name),
+        "icon_url": data.get("icon", ""),
+        "score": data.get("score"),
+        "ratings": data.get("ratings"),
+        "histogram": data.get("histogram"),
+    }
+
+
+def _fetch_apple_info(app_id: str):
+    url = f"https://itunes.apple.com/lookup?id={app_id}"
+    resp = requests.get(url, timeout=15).json()
+    results = resp.get("results", [])
+    if results:
+        r = results[0]
+        return {
+            "title": r.get("trackName", app_id),
+            "icon_url": r.get("artworkUrl100", ""),
+            "score": r.get("averageUserRating"),
+            "ratings": r.get("userRatingCount"),
+            "histogram": None,  # the lookup API has no per-star counts
+        }
+    return {"title": app_id, "icon_url": "", "score": None, "ratings": None, "histogram": None}
+
+
+_INFO_FETCHERS = {"google": _fetch_google_info, "apple": _fetch_apple_info}
+
+
+def _store_icon(store: str, app_id: str, icon_url: str) -> str:
+    if not icon_url:
+        return ""
+    try:
+        r = requests.get(icon_url, timeout=15)
+        if r.status_code != 200 or not r.content:
+            return ""
+        os.makedirs(ICON_DIR, exist_ok=True)
+        path = os.path.join(ICON_DIR, f"{store}_{_safe_name(app_id)}.png")
+        tmp = _tmp_path(path)
+        with open(tmp, "wb") as f:
+            f.write(r.content)
+        os.replace(tmp, path)
+        return path
+    except Exception:
+        return ""
+
+
+def _read_entry(store: str, app_id: str):
+    # entry files are already shared by every process on this host; a network cache shares them across hosts
+    if SHARED_CACHE_URL:
+        entry = cache_get(("metadata", store, app_id))
+        if entry:
+            return entry
+    try:
+        with open(_entry_path(store, app_id), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+
+def _write_entry(store: str, app_id: str, entry):
+    path = _entry_path(store, app_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = _tmp_path(path)
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+    if SHARED_CACHE_URL:
+        cache_set(("metadata", store, app_id), entry, METADATA_TTL)
+
+
+def _get_entry(store: str, app_id: str, max_age: int = METADATA_TTL, refresh: bool = False):
+    key = (store, app_id)
+    # loaded even on refresh: if the lookup fails, the last good entry is what we keep
+    entry = _memory_cache.get(key) or _read_entry(store, app_id)
+
+    now = time.time()
+    fresh = not refresh and entry and "ratings" in entry and now - entry.get("fetched_at", 0) < max_age
+    backing_off = not refresh and entry and now - entry.get("failed_at", 0) < FAILURE_TTL
+    if not fresh and not backing_off:
+        try:
+            info = _INFO_FETCHERS[store](app_id)
+            icon_path = entry.get("icon_path", "") if entry else ""
+            if not icon_path or not os.path.exists(icon_path):
+                icon_path = _store_icon(store, app_id, info.get("icon_url", ""))
+            entry = {**info, "icon_path": icon_path, "fetched_at": time.time()}
+            _write_entry(store, app_id, entry)
+        except Exception:
+            # stale beats nothing; otherwise fall back like before. Persisted so other reruns and processes back off too
+            entry = entry or {"title": app_id, "icon_url": "", "icon_path": "", "score": None, "ratings": None, "histogram": None, "fetched_at": 0}
+            entry = {**entry, "failed_at": now}
+            try:
+                _write_entry(store, app_id, entry)
+            except Exception:
+                pass
+
+    _memory_cache[key] = entry
+    return entry
+
+
+def get_app_info(store: str, app_id: str, refresh: bool = False):
+    entry = _get_entry(store, app_id, refresh=refresh)
+    icon = entry.get("icon_path") if entry.get("icon_path") and os.path.exists(entry["icon_path"]) else entry.get("icon_url", "")
+    return {"title": entry.get("title", app_id), "icon": icon}
+
+
+def get_google_app_info(package_name: str):
+    return get_app_info("google", package_name)
+
+
+def get_apple_app_info(app_id: str):
+    return get_app_info("apple", app_id)
+
+
+def get_rating_summary(store: str, app_id: str):
+    entry = _get_entry(store, app_id, max_age=RATINGS_TTL)
+    histogram = entry.get("histogram") or [None] * 5
+    return {
+        "title": entry.get("title", app_id),
+        "app_id": app_id,
+        "score": entry.get("score"),
+        "ratings": entry.get("ratings"),
+        "stars": {s: histogram[s - 1] for s in [1, 2, 3, 4, 5]},
+    }
+
+
+def get_rating_summaries(store: str, app_ids):
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as pool:
+        return list(pool.map(lambda a: get_rating_summary(store, a), app_ids))
+
+
+def prefetch_catalog():
+    keys = [("google", pkg) for apps in GOOGLE_APPS.values() for pkg in apps.values()]
+    keys += [("apple", app_id) for apps in APPLE_APPS.values() for app_id in apps.values()]
+
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as pool:
+        list(pool.map(lambda k: get_app_info(*k), keys))
+    return len(keys)
+
+
+def start_background_prefetch():
+    global _prefetch_started
+    with _prefetch_lock:
+        if _prefetch_started:
+            return
+        _prefetch_started = True
+    threading.Thread(target=prefetch_catalog, name="app-metadata-prefetch", daemon=True).start()
+
+
+if __name__ == "__main__":
+    print(f"Warmed metadata for {prefetch_catalog()} catalog apps.")
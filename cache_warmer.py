@@ -0,0 +1,174 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from stores import (
+    MAX_STOREFRONTS,
+    CATEGORIES,
+    GOOGLE_APPS,
+    APPLE_APPS,
+    MICROSOFT_APPS,
+    AMAZON_APPS,
+    GOOGLE_ALL_STOREFRONTS,
+    APPLE_COUNTRIES,
+    country_full_name,
+    is_incomplete,
+    parse_date_range,
+    fetch_google_reviews_date_range,
+    fetch_apple_reviews_country,
+    fetch_microsoft_reviews,
+    fetch_amazon_reviews,
+)
+from shared_cache import SHARED_CACHE_URL, cache_get, cache_set, fetch_key, fetch_ttl, prune_disk_cache
+from storefront_probe import plan_storefronts, learn_from_fetch, save_probes
+from review_archive import archive_reviews
+from app_metadata import get_app_info, get_rating_summary
+
+
+# ==========================================================
+# OFF-PEAK CACHE WARMER
+# ==========================================================
+#
+# Runs the same per-storefront fetches as the Fetch button, under the same
+# shared-cache keys, before the team starts work:
+#   python cache_warmer.py --category "Kids Games" --windows 7,yesterday --at 06:30
+# Windows: "N" = last N days through today (the UI default is 7),
+# "yesterday" = yesterday only. --at is server local time.
+
+WARM_WORKERS = 4
+HOLD_HOURS = 4  # live ranges normally expire after 15 min; keep warmed ones until people arrive
+
+_CATALOGS = {"google": GOOGLE_APPS, "apple": APPLE_APPS, "microsoft": MICROSOFT_APPS, "amazon": AMAZON_APPS}
+
+
+def warm_windows(spec: str):
+    today = datetime.now(timezone.utc).date()
+    windows = []
+    for part in [p.strip().lower() for p in spec.split(",") if p.strip()]:
+        if part == "yesterday":
+            start, end = today - timedelta(days=1), today - timedelta(days=1)
+        else:
+            start, end = today - timedelta(days=int(part)), today
+        start_dt, end_dt, _, _ = parse_date_range((start, end))
+        windows.append((start_dt, end_dt))
+    return windows
+
+
+def _warm_one(key, ttl: int, fn, *args):
+    df = cache_get(key)
+    if df is not None:
+        return df, False
+    df = fn(*args)  # a failed fetch raises and is counted as failed by the caller
+    if not is_incomplete(df):
+        cache_set(key, df, ttl)
+    return df, True
+
+
+def _storefront_jobs(store: str, app_id: str, start_dt: datetime, end_dt: datetime):
+    if store == "google":
+        storefronts = GOOGLE_ALL_STOREFRONTS[:MAX_STOREFRONTS] if MAX_STOREFRONTS else GOOGLE_ALL_STOREFRONTS
+        storefronts, _ = plan_storefronts("google", app_id, storefronts, start_dt, end_dt)
+        return [(c, fetch_google_reviews_date_range, (app_id, start_dt, end_dt, lang, c)) for c, lang, _ in storefronts]
+    if store == "apple":
+        countries = APPLE_COUNTRIES[:MAX_STOREFRONTS] if MAX_STOREFRONTS else APPLE_COUNTRIES
+        storefronts, _ = plan_storefronts("apple", app_id, [(c, "", country_full_name(c)) for c in countries], start_dt, end_dt)
+        return [(c, fetch_apple_reviews_country, (app_id, c, start_dt, end_dt)) for c, _, _ in storefronts]
+    if store == "microsoft":
+        return [("all", fetch_microsoft_reviews, (app_id, start_dt, end_dt))]
+    return [("us", fetch_amazon_reviews, (app_id, start_dt, end_dt))]
+
+
+def warm_app(store: str, app_id: str, windows, hold_seconds: int):
+    stats = {"fetched": 0, "cached": 0, "failed": 0, "archived": 0}
+
+    for start_dt, end_dt in windows:
+        ttl = max(fetch_ttl(end_dt), hold_seconds)
+        frames = []
+        for storefront, fn, args in _storefront_jobs(store, app_id, start_dt, end_dt):
+            try:
+                df, fetched = _warm_one(fetch_key(store, app_id, storefront, start_dt, end_dt), ttl, fn, *args)
+            except Exception:
+                stats["failed"] += 1
+                continue
+            stats["fetched" if fetched else "cached"] += 1
+            if store in ("google", "apple"):
+                learn_from_fetch(store, app_id, storefront, df, end_dt)
+            if fetched and not df.empty:
+                frames.append(df)
+
+        if frames:
+            try:
+                stats["archived"] += archive_reviews(store, app_id, pd.concat(frames, ignore_index=True))
+            except Exception:
+                pass
+
+    if store in ("google", "apple"):
+        try:
+            get_app_info(store, app_id, refresh=True)
+            get_rating_summary(store, app_id)
+        except Exception:
+            pass
+    return stats
+
+
+def run_once(stores, categories, windows, app_labels=None, hold_seconds: int = HOLD_HOURS * 3600):
+    jobs = [
+        (store, app_id)
+        for store in stores
+        for category in categories
+        for label, app_id in _CATALOGS[store].get(category, {}).items()
+        if not app_labels or label in app_labels
+    ]
+
+    totals = {"apps": len(jobs), "fetched": 0, "cached": 0, "failed": 0, "archived": 0}
+    with ThreadPoolExecutor(max_workers=WARM_WORKERS) as pool:
+        for stats in pool.map(lambda j: warm_app(j[0], j[1], windows, hold_seconds), jobs):
+            for k, v in stats.items():
+                totals[k] += v
+
+    save_probes()
+    if not SHARED_CACHE_URL:
+        totals["pruned"] = prune_disk_cache()
+    return totals
+
+
+def next_run(at: str) -> datetime:
+    hour, minute = (int(x) for x in at.split(":"))
+    now = datetime.now()
+    run_at = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    return run_at if run_at > now else run_at + timedelta(days=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-fetch catalog reviews into the shared cache before business hours.")
+    parser.add_argument("--store", choices=list(_CATALOGS) + ["all"], default="all")
+    parser.add_argument("--category", action="append", choices=CATEGORIES, help="Repeatable. Default: all categories.")
+    parser.add_argument("--app", action="append", help="Catalog label, repeatable. Default: every app in the categories.")
+    parser.add_argument("--windows", default="7", help='Comma separated: "N" = last N days through today, or "yesterday".')
+    parser.add_argument("--hold", type=float, default=HOLD_HOURS, help="Hours to keep warmed ranges that reach today.")
+    parser.add_argument("--at", default="06:00", help="Daily start time HH:MM, server local time.")
+    parser.add_argument("--once", action="store_true", help="Warm now and exit (for cron).")
+    args = parser.parse_args()
+
+    stores = list(_CATALOGS) if args.store == "all" else [args.store]
+    categories = args.category or CATEGORIES
+
+    while True:
+        if not args.once:
+            run_at = next_run(args.at)
+            print(f"Next warm-up at {run_at:%Y-%m-%d %H:%M}", flush=True)
+            time.sleep(max(0, (run_at - datetime.now()).total_seconds()))
+
+        # windows are computed at run time so "yesterday" rolls over
+        started = time.time()
+        totals = run_once(stores, categories, warm_windows(args.windows), set(args.app or []), int(args.hold * 3600))
+        print(f"{datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC • {totals} in {time.time() - started:.0f}s", flush=True)
+        if args.once:
+            break
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from stores import DATA_DIR, review_ids
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+# ==========================================================
+# APPEND-ONLY CHANGE FEED
+# ==========================================================
+#
+# data/feed/<store>/<app_id>/
+#     000001.jsonl, 000002.parquet, ...   one segment per sync, only unseen reviews
+#     seen_ids.txt                        every Review ID already written
+#     cursor.json                         {"last_segment": n, "last_sync": ..., "total": ...}
+#     .lock                               held while a sync writes (any process / replica)
+#
+# Consumers keep the last segment number they processed and call
+# read_segments(store, app_id, after=<that number>).
+
+FEED_DIR = os.path.join(DATA_DIR, "feed")
+FEED_FORMATS = ["jsonl", "parquet"]
+FEED_FORMAT = os.environ.get("REVIEWS_FEED_FORMAT", "jsonl")
+
+FEED_COLUMNS = ["Review ID", "dt_utc", "User Name", "Review Note", "Star", "App Version", "Device Language", "Country"]
+
+_feed_lock = threading.Lock()
+_seen_cache = {}  # feed path -> (ids, bytes of seen_ids.txt already read)
+
+
+def _feed_path(store: str, app_id: str) -> str:
+    safe_app = re.sub(r"[^A-Za-z0-9._-]", "_", str(app_id))
+    return os.path.join(FEED_DIR, store, safe_app)
+
+
+def read_cursor(store: str, app_id: str):
+    try:
+        with open(os.path.join(_feed_path(store, app_id), "cursor.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {"last_segment": 0, "last_sync": "", "total": 0}
+
+
+@contextmanager
+def _locked(path: str):
+    # the thread lock covers this process; the file lock covers other processes sharing DATA_DIR
+    with _feed_lock, open(os.path.join(path, ".lock"), "a+b") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _load_seen(path: str) -> set:
+    # only the lines appended since the last call (by any process) are read
+    ids, offset = _seen_cache.get(path, (set(), 0))
+    try:
+        with open(os.path.join(path, "seen_ids.txt"), "rb") as f:
+            if os.fstat(f.fileno()).st_size < offset:  # replaced or truncated
+                ids, offset = set(), 0
+            f.seek(offset)
+            data = f.read()
+    except FileNotFoundError:
+        ids, offset, data = set(), 0, b""
+
+    end = data.rfind(b"\n") + 1
+    ids.update(line.strip() for line in data[:end].decode("utf-8").splitlines() if line.strip())
+    _seen_cache[path] = (ids, offset + end)
+    return ids
+
+
+def append_new_reviews(store: str, app_id: str, raw_df: pd.DataFrame, fmt: str = FEED_FORMAT) -> int:
+    if raw_df.empty:
+        return 0
+    if fmt not in FEED_FORMATS:
+        raise ValueError(f"Unknown feed format: {fmt}")
+
+    df = raw_df.copy()
+    for col in FEED_COLUMNS:
+        if col not in df.columns:
+            df[col] = ""
+    df["Review ID"] = review_ids(df)
+    df = df.drop_duplicates(subset=["Review ID"])
+
+    path = _feed_path(store, app_id)
+    os.makedirs(path, exist_ok=True)
+    with _locked(path):
+        seen = _load_seen(path)
+        new = df[~df["Review ID"].isin(seen)][FEED_COLUMNS]
+        if new.empty:
+            return 0
+
+        new = new.sort_values("dt_utc", key=lambda s: pd.to_datetime(s, utc=True, errors="coerce")).reset_index(drop=True)
+        new["dt_utc"] = pd.to_datetime(new["dt_utc"], utc=True, errors="coerce").dt.strftime("%Y-%m-%dT%H:%M:%SZ").fillna("")
+
+        cursor = read_cursor(store, app_id)
+        segment = cursor["last_segment"] + 1
+        segment_file = os.path.join(path, f"{segment:06d}.{fmt}")
+        tmp = segment_file + ".tmp"
+        if fmt == "parquet":
+            new.to_parquet(tmp, index=False)
+        else:
+            new.to_json(tmp, orient="records", lines=True, force_ascii=False)
+        os.replace(tmp, segment_file)
+
+        # ids are recorded only after the segment is in place, so a crash re-emits rather than drops
+        with open(os.path.join(path, "seen_ids.txt"), "a", encoding="utf-8") as f:
+            f.write("\n".join(new["Review ID"]) + "\n")
+
+        cursor = {
+            "last_segment": segment,
+            "last_sync": datetime.now(timezone.utc).isoformat(),
+            "total": cursor["total"] + len(new),
+        }
+        with open(os.path.join(path, "cursor.json.tmp"), "w", encoding="utf-8") as f:
+            json.dump(cursor, f)
+        os.replace(os.path.join(path, "cursor.json.tmp"), os.path.join(path, "cursor.json"))
+
+    return len(new)
+
+
+def read_segments(store: str, app_id: str, after: int = 0):
+    path = _feed_path(store, app_id)
+    try:
+        names = sorted(os.listdir(path))
+    except FileNotFoundError:
+        return
+
+    for name in names:
+        m = re.fullmatch(r"(\d{6})\.(jsonl|parquet)", name)
+        if not m or int(m.group(1)) <= after:
+            continue
+        full = os.path.join(path, name)
+        if m.group(2) == "parquet":
+            df = pd.read_parquet(full)
+        else:
+            df = pd.read_json(full, orient="records", lines=True, dtype=False)
+        yield int(m.group(1)), df
@@ -0,0 +1,147 @@
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+from stores import DATA_DIR
+
+
+# ==========================================================
+# SESSION DATASETS: MEMORY BUDGET + LRU DISK SPILL
+# ==========================================================
+#
+# Every session's fetched frames live here instead of st.session_state.
+# When the process total goes over the budget, the least recently used
+# datasets (any session) are pickled to data/spill/ and reloaded on access.
+
+MEMORY_BUDGET_BYTES = int(float(os.environ.get("REVIEWS_MEMORY_BUDGET_MB", "1024")) * 1024 * 1024)
+SPILL_DIR = os.path.join(DATA_DIR, "spill")
+SPILL_TTL = 24 * 3600  # spilled datasets of sessions nobody came back to
+SPILL_SWEEP_INTERVAL = 600  # also clears files left in SPILL_DIR by earlier processes
+
+_lock = threading.RLock()
+_datasets = OrderedDict()  # (session_id, name) -> {"df": DataFrame | None, "bytes": int, "spill": path | None}
+_resident_bytes = 0
+_last_sweep = 0.0
+
+
+def _frame_bytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _spill_path(session_id: str, name: str) -> str:
+    return os.path.join(SPILL_DIR, f"{re.sub(r'[^A-Za-z0-9_-]', '_', session_id)}__{name}.pkl")
+
+
+def _remove_spill(entry):
+    if entry.get("spill"):
+        try:
+            os.remove(entry["spill"])
+        except OSError:
+            pass
+        entry["spill"] = None
+
+
+def _evict(keep_key):
+    global _resident_bytes
+    for key in list(_datasets.keys()):
+        if _resident_bytes <= MEMORY_BUDGET_BYTES:
+            break
+        entry = _datasets[key]
+        if key == keep_key or entry["df"] is None:
+            continue
+
+        os.makedirs(SPILL_DIR, exist_ok=True)
+        path = _spill_path(*key)
+        entry["df"].to_pickle(path)
+        entry["df"], entry["spill"] = None, path
+        _resident_bytes -= entry["bytes"]
+
+
+def _cleanup_spills():
+    global _last_sweep
+    now = time.time()
+    cutoff = now - SPILL_TTL
+    for key, entry in list(_datasets.items()):
+        if entry["df"] is None and entry["last_used"] < cutoff:
+            _remove_spill(entry)
+            del _datasets[key]
+
+    if now - _last_sweep < SPILL_SWEEP_INTERVAL:
+        return
+    _last_sweep = now
+
+    # spill files outlive a restart; nothing in memory points at them any more
+    live = {e["spill"] for e in _datasets.values() if e.get("spill")}
+    try:
+        names = os.listdir(SPILL_DIR)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(SPILL_DIR, name)
+        try:
+            if path not in live and os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
+
+
+def put_dataset(session_id: str, name: str, df: pd.DataFrame):
+    global _resident_bytes
+    key = (session_id, name)
+    with _lock:
+        old = _datasets.pop(key, None)
+        if old:
+            if old["df"] is not None:
+                _resident_bytes -= old["bytes"]
+            _remove_spill(old)
+
+        size = _frame_bytes(df)
+        _datasets[key] = {"df": df, "bytes": size, "rows": len(df), "spill": None, "last_used": time.time()}
+        _resident_bytes += size
+
+        _evict(keep_key=key)
+        _cleanup_spills()
+
+
+def get_dataset(session_id: str, name: str):
+    global _resident_bytes
+    key = (session_id, name)
+    with _lock:
+        entry = _datasets.get(key)
+        if entry is None:
+            return None
+
+        if entry["df"] is None:
+            try:
+                entry["df"] = pd.read_pickle(entry["spill"])
+            except Exception:
+                del _datasets[key]
+                return None
+            _remove_spill(entry)
+            _resident_bytes += entry["bytes"]
+
+        entry["last_used"] = time.time()
+        _datasets.move_to_end(key)
+        _evict(keep_key=key)
+        return entry["df"]
+
+
+def dataset_rows(session_id: str, name: str) -> int:
+    # row count without reloading a spilled frame
+    with _lock:
+        entry = _datasets.get((session_id, name))
+        return entry["rows"] if entry else 0
+
+
+def memory_stats():
+    with _lock:
+        return {
+            "resident_bytes": _resident_bytes,
+            "budget_bytes": MEMORY_BUDGET_BYTES,
+            "datasets": len(_datasets),
+            "spilled": sum(1 for e in _datasets.values() if e["df"] is None),
+        }
@@ -0,0 +1,120 @@
+import gzip
+import io
+import importlib.util
+
+import pandas as pd
+
+from stores import TABLE_COLUMNS, standardize_table
+
+
+# ==========================================================
+# STREAMING EXPORTS
+# ==========================================================
+
+EXPORT_CHUNK_ROWS = 20_000
+
+EXPORT_FORMATS = {
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+if importlib.util.find_spec("openpyxl"):
+    EXPORT_FORMATS["Excel"] = ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+
+
+def iter_chunks(df: pd.DataFrame, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    if df.empty:
+        yield df  # filters matched nothing: still export the header
+        return
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def iter_combined_chunks(datasets: dict, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    # datasets: store name -> raw session frame. Only one chunk is copied at a time.
+    empty = True
+    for store, raw in datasets.items():
+        if raw is None or raw.empty:
+            continue
+
+        if "dt_utc" in raw.columns:
+            ts = pd.to_datetime(raw["dt_utc"], utc=True, errors="coerce").reset_index(drop=True)
+            order = ts.sort_values(ascending=False, na_position="last").index.to_numpy()
+        else:
+            order = range(len(raw))
+
+        for start in range(0, len(raw), chunk_rows):
+            chunk = standardize_table(raw.iloc[order[start:start + chunk_rows]].copy())
+            chunk.insert(0, "Store", store)
+            empty = False
+            yield chunk
+
+    if empty:
+        yield pd.DataFrame(columns=["Store"] + TABLE_COLUMNS)
+
+
+def _arrow_safe(chunk: pd.DataFrame) -> pd.DataFrame:
+    # Arrow needs one type per column across every chunk and store ("Star" can be missing or text in older archives)
+    cols = {c: chunk[c].fillna("").astype(str) for c in chunk.columns if c != "Star"}
+    if "Star" in chunk.columns:
+        cols["Star"] = pd.to_numeric(chunk["Star"], errors="coerce").astype("Int64")
+    return chunk.assign(**cols)
+
+
+def _at_least_one(chunks):
+    # an export with no rows is still a valid file with a header / schema
+    seen = False
+    for chunk in chunks:
+        seen = True
+        yield chunk
+    if not seen:
+        yield pd.DataFrame(columns=TABLE_COLUMNS)
+
+
+def write_export(chunks, fmt: str) -> io.BytesIO:
+    buf = io.BytesIO()
+    first = True
+    chunks = _at_least_one(chunks)
+
+    if fmt in ("CSV", "CSV (gzip)"):
+        out = gzip.GzipFile(fileobj=buf, mode="wb") if fmt == "CSV (gzip)" else buf
+        for chunk in chunks:
+            out.write(chunk.to_csv(index=False, header=first).encode("utf-8"))
+            first = False
+        if out is not buf:
+            out.close()
+
+    elif fmt == "Parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        writer = None
+        for chunk in chunks:
+            table = pa.Table.from_pandas(_arrow_safe(chunk), preserve_index=False, schema=writer.schema if writer else None)
+            if writer is None:
+                writer = pq.ParquetWriter(buf, table.schema, compression="zstd")
+            writer.write_table(table)
+        if writer is not None:
+            writer.close()
+
+    elif fmt == "Excel":
+        row = 0
+        with pd.ExcelWriter(buf, engine="openpyxl") as xl:
+            for chunk in chunks:
+                chunk.to_excel(xl, index=False, header=first, startrow=row, sheet_name="Reviews")
+                row += len(chunk) + (1 if first else 0)
+                first = False
+
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    buf.seek(0)
+    return buf
+
+
+def export_file_name(base: str, fmt: str) -> str:
+    return f"{base}.{EXPORT_FORMATS[fmt][0]}"
+
+
+def export_mime(fmt: str) -> str:
+    return EXPORT_FORMATS[fmt][1]
@@ -0,0 +1,336 @@
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+import pandas as pd
+
+
+# ==========================================================
+# LOAD TEST: simulated Streamlit sessions, stubbed stores
+# ==========================================================
+#
+#   python loadtest.py --sessions 20 --iterations 3 --tab google
+#   python loadtest.py --sessions 50 --ramp 10 --json results.json --fail-p95 2000
+#
+# Every session is a streamlit.testing AppTest running app.py in this process,
+# one thread each, the same way one server process runs its sessions. Store
+# fetchers are replaced with synthetic data (no network), and everything the
+# app writes goes to a temporary data directory.
+
+TABS = {
+    "google": "google_raw",
+    "apple": "apple_raw",
+    "microsoft": "ms_raw",
+    "amazon": "am_raw",
+    "all": "all_raw",
+}
+
+NOTES = [
+    "Great app, my kids love it",
+    "Keeps crashing after the last update",
+    "Too many ads, every level shows an ad",
+    "Paid for premium but purchase not restored",
+    "Wish it had more languages",
+    "Very slow and laggy on my tablet",
+    "No sound on some levels",
+    "Best learning game so far",
+]
+
+
+# ---------- stubbed backends ----------
+
+def _synthetic_reviews(seed: str, start_dt, end_dt, rows: int, country: str):
+    rng = random.Random(seed)
+    span = max(int((end_dt - start_dt).total_seconds()), 1)
+    return pd.DataFrame([
+        {
+            "User Name": f"user{rng.randrange(rows * 20)}",
+            "dt_utc": start_dt + timedelta(seconds=rng.randrange(span)),
+            "Review Note": f"{rng.choice(NOTES)} #{rng.randrange(1000)}",
+            "Star": rng.choices([1, 2, 3, 4, 5], weights=[15, 8, 10, 17, 50])[0],
+            "App Version": f"{rng.randrange(1, 6)}.{rng.randrange(10)}",
+            "Device Language": "English",
+            "Country": country,
+        }
+        for _ in range(rows)
+    ])
+
+
+def install_stubs(data_dir: str, rows: int, latency_ms: float, use_cache: bool):
+    # must run before app modules import DATA_DIR / the cache backend
+    os.environ.pop("REVIEWS_CACHE_URL", None)
+    import stores
+    stores.DATA_DIR = data_dir
+
+    import store_fetch
+    import app_metadata
+
+    def pause():
+        time.sleep(latency_ms / 1000)
+
+    def google(app_id, start_dt, end_dt, lang, country, **_):
+        pause()
+        return _synthetic_reviews(f"g{app_id}{country}", start_dt, end_dt, rows, stores.country_full_name(country))
+
+    def apple(app_id, country, start_dt, end_dt, **_):
+        pause()
+        return _synthetic_reviews(f"a{app_id}{country}", start_dt, end_dt, rows, stores.country_full_name(country))
+
+    def single_market(prefix):
+        def fetch(app_id, start_dt=None, end_dt=None, *args, **kwargs):
+            pause()
+            return _synthetic_reviews(f"{prefix}{app_id}", start_dt, end_dt, rows * 5, "United States")
+        return fetch
+
+    store_fetch.fetch_google_reviews_date_range = google
+    store_fetch.fetch_apple_reviews_country = apple
+    store_fetch.fetch_microsoft_reviews = single_market("m")
+    store_fetch.fetch_amazon_reviews = single_market("z")
+    store_fetch.plan_storefronts = lambda store, app_id, storefronts, start_dt, end_dt: (list(storefronts), [])
+    store_fetch.learn_from_fetch = lambda *args, **kwargs: None
+    if not use_cache:
+        store_fetch.cached_call = lambda key, ttl, fn, *args, **kwargs: fn(*args, **kwargs)
+
+    app_metadata.start_background_prefetch = lambda: None
+    app_metadata.get_google_app_info = lambda app_id: {"title": app_id, "icon": ""}
+    app_metadata.get_apple_app_info = lambda app_id: {"title": app_id, "icon": ""}
+
+
+# Streamlit versions the runtime patches below were checked against. They touch
+# private internals (Runtime._instance, ScriptCache); on any other version the
+# sessions run one after another instead of concurrently.
+SHARED_RUNTIME_VERSIONS = ("1.66.",)
+
+
+def share_streamlit_runtime() -> bool:
+    # AppTest is built for one session at a time. Make its per-run globals behave
+    # like a single server process hosting many sessions.
+    import streamlit
+
+    # "missing ScriptRunContext" noise from setting session state off the script thread
+    logging.getLogger("streamlit.runtime.scriptrunner_utils.script_run_context").addFilter(
+        lambda record: "missing ScriptRunContext" not in record.getMessage()
+    )
+    if not streamlit.__version__.startswith(SHARED_RUNTIME_VERSIONS):
+        return False
+
+    from streamlit import config
+    from streamlit.runtime.runtime import Runtime
+    from streamlit.runtime.scriptrunner import script_cache
+
+    # every run patches global.appTest=True and restores the saved value afterwards
+    config.set_option("global.appTest", True)
+
+    # each run sets Runtime._instance and clears it when done, under other sessions' feet
+    last = {}
+    original_instance = Runtime.instance.__func__
+
+    def instance(cls):
+        if cls._instance is not None:
+            last["runtime"] = cls._instance
+            return cls._instance
+        return last["runtime"] if "runtime" in last else original_instance(cls)
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or "runtime" in last)
+
+    # a fresh ScriptCache per run would re-parse app.py every rerun (and concurrent
+    # parses trip a CPython 3.11 ast bug); a server compiles it once
+
+    lock = threading.Lock()
+    compiled = {}
+    original = script_cache.ScriptCache.get_bytecode
+
+    def get_bytecode(self, script_path):
+        with lock:
+            if script_path not in compiled:
+                compiled[script_path] = original(self, script_path)
+            return compiled[script_path]
+
+    script_cache.ScriptCache.get_bytecode = get_bytecode
+    return True
+
+
+# ---------- one simulated session ----------
+
+def _timed(timings, step: str, fn):
+    started = time.perf_counter()
+    fn()
+    timings.append((step, time.perf_counter() - started))
+
+
+def _widget_value(widget, key: str, default=None):
+    # the All Stores tab has no country filter or collapse checkbox
+    try:
+        return widget(key=key).value
+    except KeyError:
+        return default
+
+
+def _export_filtered(at, prefix: str, export_fmt: str):
+    # the download button builds its file lazily in the browser request, which AppTest
+    # can't click; build it through the same helpers the tab uses, from the session's widgets
+    from dataset_manager import get_dataset
+    from review_table import review_table, filtered_export
+    from stores import apply_filters
+
+    df = review_table(
+        get_dataset(at.session_state["dataset_session_id"], prefix),
+        _widget_value(at.checkbox, f"{prefix}_collapse_dupes"),
+    )
+    if df.empty:
+        return  # the tab shows no download button
+    filtered = apply_filters(
+        df,
+        at.multiselect(key=f"{prefix}_star_filter").value,
+        at.text_input(key=f"{prefix}_search").value,
+        at.multiselect(key=f"{prefix}_theme_filter").value,
+        _widget_value(at.multiselect, f"{prefix}_country_filter"),
+    )
+    filtered_export(filtered, export_fmt)
+
+
+def run_session(tab: str, iterations: int, export_fmt: str, results: list, errors: list):
+    from streamlit.testing.v1 import AppTest
+
+    prefix = TABS[tab]
+    timings = []
+    try:
+        at = AppTest.from_file(os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py"), default_timeout=600)
+        at.session_state["logged_in"] = True
+
+        _timed(timings, "initial load", at.run)
+        if tab != "google":
+            _timed(timings, "open tab", lambda: at.radio(key="active_view").set_value(tab).run())
+        _timed(timings, "fetch", lambda: at.button(key=f"{prefix}_fetch").click().run())
+
+        for _ in range(iterations):
+            _timed(timings, "star filter", lambda: at.multiselect(key=f"{prefix}_star_filter").set_value([1, 2]).run())
+            _timed(timings, "search", lambda: at.text_input(key=f"{prefix}_search").input("crash").run())
+            _timed(timings, "themes", lambda: at.multiselect(key=f"{prefix}_theme_filter").set_value(["Crash", "Ads"]).run())
+            _timed(timings, "download", lambda: _export_filtered(at, prefix, export_fmt))
+            _timed(timings, "clear filters", lambda: (
+                at.multiselect(key=f"{prefix}_star_filter").set_value([1, 2, 3, 4, 5]),
+                at.text_input(key=f"{prefix}_search").input(""),
+                at.multiselect(key=f"{prefix}_theme_filter").set_value([]),
+                at.run(),
+            ))
+
+        if at.exception:
+            errors.append(at.exception[0].message)
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+    results.extend(timings)
+
+
+# ---------- measurement ----------
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def _cpu_seconds() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def summarize(timings, sessions: int, wall: float, cpu: float, rss_before: int, rss_after: int, memory):
+    df = pd.DataFrame(timings, columns=["step", "seconds"])
+    steps = df.groupby("step", sort=False)["seconds"].describe(percentiles=[0.5, 0.9, 0.95, 0.99])
+    steps = (steps[["count", "50%", "90%", "95%", "99%", "max"]] * [1, 1000, 1000, 1000, 1000, 1000]).round(1)
+    steps["count"] = steps["count"].astype(int)
+
+    reruns = df[df["step"] != "download"]["seconds"]
+    return {
+        "sessions": sessions,
+        "wall_seconds": round(wall, 2),
+        "reruns": int(len(reruns)),
+        "reruns_per_second": round(len(reruns) / wall, 2) if wall else 0,
+        "rerun_ms": {p: round(float(reruns.quantile(q)) * 1000, 1) for p, q in [("p50", 0.5), ("p90", 0.9), ("p95", 0.95), ("p99", 0.99)]} if len(reruns) else {},
+        "cpu_seconds_per_session": round(cpu / sessions, 3),
+        "cpu_utilization": round(cpu / wall, 2) if wall else 0,
+        "rss_mb_per_session": round((rss_after - rss_before) / sessions / 1024 / 1024, 2),
+        "rss_mb_total": round(rss_after / 1024 / 1024, 1),
+        "dataset_mb_resident": round(memory["resident_bytes"] / 1024 / 1024, 1),
+        "datasets_spilled": memory["spilled"],
+        "steps_ms": steps.to_dict(orient="index"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive simulated Streamlit sessions against stubbed stores.")
+    parser.add_argument("--sessions", type=int, default=10, help="Concurrent simulated users.")
+    parser.add_argument("--ramp", type=float, default=0, help="Seconds over which sessions start.")
+    parser.add_argument("--iterations", type=int, default=3, help="Filter/search/download cycles per session.")
+    parser.add_argument("--tab", choices=list(TABS), default="google")
+    parser.add_argument("--rows", type=int, default=40, help="Synthetic reviews per storefront.")
+    parser.add_argument("--latency-ms", type=float, default=20, help="Simulated store latency per request.")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the shared fetch cache (every fetch is a miss).")
+    parser.add_argument("--export-format", default="CSV (gzip)")
+    parser.add_argument("--memory-budget-mb", type=float, default=None, help="Override REVIEWS_MEMORY_BUDGET_MB.")
+    parser.add_argument("--json", default="", help="Write the summary to this file.")
+    parser.add_argument("--fail-p95", type=float, default=0, help="Exit 1 if rerun p95 exceeds this many ms.")
+    args = parser.parse_args()
+
+    if args.memory_budget_mb is not None:
+        os.environ["REVIEWS_MEMORY_BUDGET_MB"] = str(args.memory_budget_mb)
+
+    with tempfile.TemporaryDirectory(prefix="reviews-loadtest-") as data_dir:
+        install_stubs(data_dir, args.rows, args.latency_ms, not args.no_cache)
+        concurrent = share_streamlit_runtime()
+        if not concurrent:
+            import streamlit
+            print(f"Streamlit {streamlit.__version__} is not in SHARED_RUNTIME_VERSIONS: sessions run one at a time.", file=sys.stderr)
+        from dataset_manager import memory_stats
+
+        timings, errors = [], []
+        threads = [
+            threading.Thread(target=run_session, args=(args.tab, args.iterations, args.export_format, timings, errors), daemon=True)
+            for _ in range(args.sessions)
+        ]
+
+        rss_before, cpu_before, started = _rss_bytes(), _cpu_seconds(), time.perf_counter()
+        for i, thread in enumerate(threads):
+            thread.start()
+            if not concurrent:
+                thread.join()
+            elif args.ramp and i < len(threads) - 1:
+                time.sleep(args.ramp / len(threads))
+        for thread in threads:
+            thread.join()
+        wall, cpu = time.perf_counter() - started, _cpu_seconds() - cpu_before
+
+        summary = summarize(timings, args.sessions, wall, cpu, rss_before, _rss_bytes(), memory_stats())
+        summary["concurrent"] = concurrent
+        summary["errors"] = errors
+
+    print(pd.DataFrame(summary["steps_ms"]).T.to_string())
+    print()
+    for key, value in summary.items():
+        if key not in ("steps_ms", "errors"):
+            print(f"{key}: {value}")
+    for error in errors:
+        print(f"ERROR: {error}", file=sys.stderr)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+    if errors or (args.fail_p95 and summary["rerun_ms"].get("p95", 0) > args.fail_p95):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import hashlib
+import re
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+# ==========================================================
+# NEAR-DUPLICATE / SPAM DETECTION (MinHash + LSH)
+# ==========================================================
+
+NUM_PERM = 64
+LSH_BANDS = 16  # 16 bands x 4 rows -> ~0.5 similarity starts colliding
+DEFAULT_THRESHOLD = 0.8
+MIN_NOTE_CHARS = 25  # "Good game" from 500 users is not spam
+MAX_CACHED_SIGNATURES = 500_000
+MAX_CACHED_GROUPINGS = 32  # recent datasets whose clusters are reused across reruns
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_BAND_MIX = np.uint64(1099511628211)
+
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+# signature per normalized review text, shared by all sessions of the process
+_SIGNATURE_CACHE = {}
+# cluster labels per (dataset, threshold), so reruns don't redo the LSH pass
+_GROUP_CACHE = OrderedDict()
+
+
+def normalize_note(text: str) -> str:
+    return re.sub(r"[\W_]+", " ", (text or "").lower()).strip()
+
+
+def _minhash(text: str) -> np.ndarray:
+    data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    if len(data) < 4:
+        data = np.pad(data, (0, 4 - len(data)))
+
+    # 4-byte character shingles packed into one integer each
+    shingles = (data[:-3] << np.uint64(24)) | (data[1:-2] << np.uint64(16)) | (data[2:-1] << np.uint64(8)) | data[3:]
+
+    hashed = (np.outer(_PERM_A, shingles) + _PERM_B[:, None]) % _MERSENNE_PRIME & _MAX_HASH
+    return hashed.min(axis=1)
+
+
+def minhash_signatures(notes: pd.Series):
+    notes = notes.fillna("").astype(str)
+    sigs = np.full((len(notes), NUM_PERM), _MAX_HASH, dtype=np.uint64)
+    eligible = np.zeros(len(notes), dtype=bool)
+
+    for i, note in enumerate(notes):
+        text = normalize_note(note)
+        if len(text) < MIN_NOTE_CHARS:
+            continue
+
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+        sig = _SIGNATURE_CACHE.get(key)
+        if sig is None:
+            sig = _minhash(text)
+            if len(_SIGNATURE_CACHE) >= MAX_CACHED_SIGNATURES:
+                _SIGNATURE_CACHE.clear()
+            _SIGNATURE_CACHE[key] = sig
+
+        sigs[i] = sig
+        eligible[i] = True
+
+    return sigs, eligible
+
+
+def near_duplicate_groups(notes: pd.Series, threshold: float = DEFAULT_THRESHOLD) -> np.ndarray:
+    n = len(notes)
+    parent = np.arange(n)
+    if n < 2:
+        return parent
+
+    sigs, eligible = minhash_signatures(notes)
+    idx = np.flatnonzero(eligible)
+    rows_per_band = NUM_PERM // LSH_BANDS
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for b in range(LSH_BANDS):
+        band = sigs[idx, b * rows_per_band:(b + 1) * rows_per_band]
+        bucket = band[:, 0].copy()
+        for c in range(1, rows_per_band):
+            bucket = (bucket * _BAND_MIX) ^ band[:, c]
+
+        order = np.argsort(bucket, kind="stable")
+        sorted_bucket = bucket[order]
+        starts = np.flatnonzero(np.r_[True, sorted_bucket[1:] != sorted_bucket[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+        multi = (ends - starts) >= 2
+
+        for s, e in zip(starts[multi], ends[multi]):
+            members = idx[order[s:e]]
+            lead = members[0]
+            for m in members[1:]:
+                ra, rb = find(lead), find(m)
+                if ra == rb:
+                    continue
+                # LSH only proposes candidates; confirm with the estimated Jaccard
+                if np.mean(sigs[lead] == sigs[m]) >= threshold:
+                    parent[max(ra, rb)] = min(ra, rb)
+
+    return np.array([find(i) for i in range(n)])
+
+
+def _dataset_key(df: pd.DataFrame, threshold: float) -> bytes:
+    # Review ID covers user, time and text; row order matters because labels are row positions
+    column = df["Review ID"] if "Review ID" in df.columns else df["Review Note"]
+    row_hashes = pd.util.hash_pandas_object(column, index=False).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes() + repr(threshold).encode(), digest_size=16).digest()
+
+
+def cached_groups(df: pd.DataFrame, threshold: float = DEFAULT_THRESHOLD) -> np.ndarray:
+    key = _dataset_key(df, threshold)
+    groups = _GROUP_CACHE.get(key)
+    if groups is not None:
+        _GROUP_CACHE.move_to_end(key)
+        return groups
+
+    groups = near_duplicate_groups(df["Review Note"], threshold)
+    _GROUP_CACHE[key] = groups
+    while len(_GROUP_CACHE) > MAX_CACHED_GROUPINGS:
+        _GROUP_CACHE.popitem(last=False)
+    return groups
+
+
+def flag_near_duplicates(df: pd.DataFrame, collapse: bool = False, threshold: float = DEFAULT_THRESHOLD) -> pd.DataFrame:
+    if df.empty or "Review Note" not in df.columns:
+        return df
+
+    groups = pd.Series(cached_groups(df, threshold), index=df.index)
+    df = df.assign(**{"Similar Reviews": groups.map(groups.value_counts()).astype(int)})
+
+    if collapse:
+        # rows are sorted newest first, so the most recent copy of each cluster is kept
+        df = df[~groups.duplicated(keep="first")].reset_index(drop=True)
+
+    return df
@@ -0,0 +1,248 @@
+import argparse
+import json
+import math
+import os
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import requests
+
+from stores import (
+    DATA_DIR,
+    CATEGORIES,
+    GOOGLE_APPS,
+    APPLE_APPS,
+    GOOGLE_ALL_STOREFRONTS,
+    country_full_name,
+    is_incomplete,
+    fetch_google_reviews_date_range,
+    fetch_apple_reviews_country,
+)
+
+
+# ==========================================================
+# SETTINGS
+# ==========================================================
+
+ALERT_STATE_FILE = os.path.join(DATA_DIR, "alert_state.json")
+ALERTS_FILE = os.path.join(DATA_DIR, "alerts.jsonl")
+ALERT_WEBHOOK_URL = os.environ.get("REVIEWS_ALERT_WEBHOOK", "")
+
+EWMA_ALPHA = 0.05           # weight of the newest hour in the baseline
+Z_THRESHOLD = 3.0           # std devs above baseline before alerting
+MIN_STD = 0.05              # floor so a perfectly flat baseline does not alert on one review
+MIN_HOURLY_REVIEWS = 5      # ignore hours with too few reviews to mean anything
+MIN_BASELINE_HOURS = 6      # active hours needed before a baseline is trusted
+MIN_LOW_STAR_RATE = 0.3     # never alert below 30% 1-2 star reviews
+FIRST_RUN_LOOKBACK_HOURS = 48
+
+
+# ==========================================================
+# BASELINE (constant memory per app + country)
+# ==========================================================
+
+def _new_baseline():
+    return {"mean": 0.0, "var": 0.0, "hours": 0, "bucket": "", "low": 0, "total": 0, "cursor": "", "alerted": ""}
+
+
+def _close_bucket(state):
+    if state["total"] > 0:
+        rate = state["low"] / state["total"]
+        if state["hours"] == 0:
+            state["mean"], state["var"] = rate, 0.0
+        else:
+            diff = rate - state["mean"]
+            incr = EWMA_ALPHA * diff
+            state["mean"] += incr
+            state["var"] = (1 - EWMA_ALPHA) * (state["var"] + diff * incr)
+        state["hours"] += 1
+    state["low"], state["total"] = 0, 0
+
+
+def _check_bucket(state, key):
+    if state["total"] < MIN_HOURLY_REVIEWS or state["hours"] < MIN_BASELINE_HOURS:
+        return None
+    if state["alerted"] == state["bucket"]:
+        return None
+
+    rate = state["low"] / state["total"]
+    z = (rate - state["mean"]) / max(math.sqrt(state["var"]), MIN_STD)
+    if rate < MIN_LOW_STAR_RATE or z < Z_THRESHOLD:
+        return None
+
+    state["alerted"] = state["bucket"]
+    store, app_id, country = key.split(":", 2)
+    return {
+        "ts": datetime.now(timezone.utc).isoformat(),
+        "store": store,
+        "app_id": app_id,
+        "country": country_full_name(country),
+        "hour": state["bucket"],
+        "low_star_rate": round(rate, 3),
+        "baseline_rate": round(state["mean"], 3),
+        "reviews": state["total"],
+        "z": round(z, 2),
+    }
+
+
+def observe(state, key, df: pd.DataFrame):
+    alerts = []
+    if df.empty:
+        return alerts
+
+    df = df[df["dt_utc"].notna()]
+    if df.empty:
+        return alerts
+
+    at = pd.to_datetime(df["dt_utc"], utc=True)
+    stars = pd.to_numeric(df["Star"], errors="coerce")
+    hourly = pd.DataFrame({"hour": at.dt.floor("h"), "low": stars.isin([1, 2])}).groupby("hour")["low"].agg(["sum", "count"])
+
+    for hour, row in hourly.sort_index().iterrows():
+        bucket = hour.isoformat()
+        if state["bucket"] and bucket < state["bucket"]:
+            continue  # late review for an hour already folded into the baseline
+        if bucket != state["bucket"]:
+            if state["bucket"]:
+                alert = _check_bucket(state, key)
+                if alert:
+                    alerts.append(alert)
+            _close_bucket(state)
+            state["bucket"] = bucket
+        state["low"] += int(row["sum"])
+        state["total"] += int(row["count"])
+
+    # the current hour can alert before it closes
+    alert = _check_bucket(state, key)
+    if alert:
+        alerts.append(alert)
+
+    state["cursor"] = at.max().isoformat()
+    return alerts
+
+
+# ==========================================================
+# STATE + ALERT OUTPUT
+# ==========================================================
+
+def load_state():
+    try:
+        with open(ALERT_STATE_FILE, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_state(state):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tmp = ALERT_STATE_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, ALERT_STATE_FILE)
+
+
+def emit_alerts(alerts):
+    if not alerts:
+        return
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    with open(ALERTS_FILE, "a", encoding="utf-8") as f:
+        for a in alerts:
+            f.write(json.dumps(a) + "\n")
+
+    if ALERT_WEBHOOK_URL:
+        for a in alerts:
+            try:
+                requests.post(ALERT_WEBHOOK_URL, json=a, timeout=10)
+            except Exception:
+                continue
+
+
+def recent_alerts(hours: int = 24, limit: int = 5):
+    cutoff = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat()
+    try:
+        with open(ALERTS_FILE, "r", encoding="utf-8") as f:
+            lines = f.readlines()[-200:]
+    except Exception:
+        return []
+
+    alerts = []
+    for line in lines:
+        try:
+            a = json.loads(line)
+        except Exception:
+            continue
+        if a.get("ts", "") >= cutoff:
+            alerts.append(a)
+    return alerts[-limit:][::-1]
+
+
+# ==========================================================
+# POLLING
+# ==========================================================
+
+def poll_storefront(state_all, store: str, app_id: str, country: str, lang: str, now: datetime):
+    key = f"{store}:{app_id}:{country}"
+    state = state_all.setdefault(key, _new_baseline())
+
+    if state["cursor"]:
+        start_dt = datetime.fromisoformat(state["cursor"]) + timedelta(microseconds=1)
+    else:
+        start_dt = now - timedelta(hours=FIRST_RUN_LOOKBACK_HOURS)
+
+    try:
+        if store == "google":
+            df = fetch_google_reviews_date_range(app_id, start_dt, now, lang, country)
+        else:
+            df = fetch_apple_reviews_country(app_id, country, start_dt, now)
+    except Exception:
+        return []
+    if is_incomplete(df):
+        return []  # don't move the cursor past pages we never saw
+
+    return observe(state, key, df)
+
+
+def run_once(stores, categories, countries=None):
+    state_all = load_state()
+    now = datetime.now(timezone.utc)
+    alerts = []
+
+    storefronts = [s for s in GOOGLE_ALL_STOREFRONTS if not countries or s[0] in countries]
+    catalogs = {"google": GOOGLE_APPS, "apple": APPLE_APPS}
+
+    for store in stores:
+        for category in categories:
+            for app_id in catalogs[store].get(category, {}).values():
+                for country_code, lang_code, _ in storefronts:
+                    alerts.extend(poll_storefront(state_all, store, app_id, country_code, lang_code, now))
+
+    save_state(state_all)
+    emit_alerts(alerts)
+    return alerts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch store reviews for 1-2 star spikes.")
+    parser.add_argument("--store", choices=["google", "apple", "all"], default="all")
+    parser.add_argument("--category", action="append", choices=CATEGORIES, help="Repeatable. Default: all categories.")
+    parser.add_argument("--countries", default="", help="Comma separated country codes. Default: all storefronts.")
+    parser.add_argument("--interval", type=int, default=60, help="Minutes between polls.")
+    parser.add_argument("--once", action="store_true", help="Poll once and exit (for cron).")
+    args = parser.parse_args()
+
+    stores = ["google", "apple"] if args.store == "all" else [args.store]
+    categories = args.category or CATEGORIES
+    countries = {c.strip().lower() for c in args.countries.split(",") if c.strip()}
+
+    while True:
+        alerts = run_once(stores, categories, countries)
+        print(f"{datetime.now(timezone.utc):%Y-%m-%d %H:%M} UTC • {len(alerts)} alert(s)", flush=True)
+        if args.once:
+            break
+        time.sleep(args.interval * 60)
+
+
+if __name__ == "__main__":
+    main()
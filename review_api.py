@@ -0,0 +1,244 @@
+import argparse
+import base64
+import gzip
+import hashlib
+import json
+import os
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pandas as pd
+
+from themes import tag_reviews
+from review_archive import UNDATED_STORES, query_archive
+from store_fetch import STORE_LABELS, fetch_store
+from stores import COUNTRY_NAMES, star_counts, apply_filters, parse_date_range, standardize_table, review_ids
+
+try:
+    from orjson import dumps as _orjson_dumps
+
+    def json_dumps(obj) -> bytes:
+        return _orjson_dumps(obj, default=str)
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+# ==========================================================
+# READ-ONLY REVIEWS API (JSON over HTTP)
+# ==========================================================
+#
+#   python review_api.py --port 8502
+#   GET /reviews?store=google&app=com.example&start=2026-10-01&end=2026-10-07
+#               &stars=1,2&countries=us,gb&q=crash&themes=Crash
+#               &fields=Date%20%26%20Time,Star,Review%20Note&limit=100&cursor=...
+#   GET /stars?...same filters...
+#   source=fetch (default, through the shared fetch cache) or source=archive
+#
+# Responses carry an ETag; send it back as If-None-Match to get a bodyless 304.
+# Set REVIEWS_API_TOKEN to require "Authorization: Bearer <token>".
+
+API_TOKEN = os.environ.get("REVIEWS_API_TOKEN", "")
+DEFAULT_DAYS = 7
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+GZIP_MIN_BYTES = 1024
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ---------- query parsing ----------
+
+def _param(params, name: str, default: str = "") -> str:
+    return params.get(name, [default])[0].strip()
+
+
+def _list_param(params, name: str):
+    return [v.strip() for v in _param(params, name).split(",") if v.strip()]
+
+
+def _date_range(params):
+    today = datetime.now(timezone.utc).date()
+    try:
+        start = date.fromisoformat(_param(params, "start")) if _param(params, "start") else today - timedelta(days=DEFAULT_DAYS)
+        end = date.fromisoformat(_param(params, "end")) if _param(params, "end") else today
+    except ValueError:
+        raise ApiError(400, "start/end must be YYYY-MM-DD")
+    if start > end:
+        raise ApiError(400, "start is after end")
+    start_dt, end_dt, _, _ = parse_date_range((start, end))
+    return start_dt, end_dt
+
+
+def _filters(params):
+    try:
+        stars = [int(s) for s in _list_param(params, "stars")]
+    except ValueError:
+        raise ApiError(400, "stars must be comma separated integers")
+    countries = [COUNTRY_NAMES.get(c.lower(), c) for c in _list_param(params, "countries")]
+    return stars, _param(params, "q"), _list_param(params, "themes"), countries
+
+
+# ---------- data ----------
+
+def load_reviews(params) -> pd.DataFrame:
+    store = _param(params, "store")
+    app_id = _param(params, "app")
+    if store not in STORE_LABELS:
+        raise ApiError(400, f"store must be one of {', '.join(STORE_LABELS)}")
+    if not app_id:
+        raise ApiError(400, "app is required")
+    start_dt, end_dt = _date_range(params)
+
+    source = _param(params, "source", "fetch")
+    if source == "archive":
+        raw = query_archive(store, [app_id], start_dt, end_dt, include_undated=store in UNDATED_STORES)
+    elif source == "fetch":
+        raw = fetch_store(store, app_id, start_dt, end_dt)
+    else:
+        raise ApiError(400, "source must be fetch or archive")
+
+    if raw is None or raw.empty:
+        return pd.DataFrame()
+
+    # standardize_table drops dt_utc; keep a sortable timestamp for the cursor
+    raw = raw.copy()
+    ts = pd.to_datetime(raw["dt_utc"], utc=True, errors="coerce").dt.as_unit("us").astype("int64")  # NaT -> int64 min
+    ts_by_id = pd.Series(ts.to_numpy(), index=review_ids(raw))
+    ts_by_id = ts_by_id[~ts_by_id.index.duplicated()]
+
+    df = tag_reviews(standardize_table(raw))
+    stars, search_text, themes, countries = _filters(params)
+    df = apply_filters(df, stars, search_text, themes, countries)
+    if df.empty:
+        return df
+
+    df = df.assign(_ts=df["Review ID"].map(ts_by_id).fillna(ts.min()).astype("int64"))
+    return df.sort_values(["_ts", "Review ID"], ascending=False, kind="mergesort").reset_index(drop=True)
+
+
+def _encode_cursor(ts: int, review_id: str) -> str:
+    return base64.urlsafe_b64encode(json_dumps({"t": int(ts), "id": review_id})).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return int(data["t"]), str(data["id"])
+    except Exception:
+        raise ApiError(400, "invalid cursor")
+
+
+def reviews_page(params):
+    df = load_reviews(params)
+
+    try:
+        limit = min(max(int(_param(params, "limit", str(DEFAULT_LIMIT))), 1), MAX_LIMIT)
+    except ValueError:
+        raise ApiError(400, "limit must be an integer")
+
+    # keyset cursor: pages stay stable when new reviews arrive at the top
+    cursor = _param(params, "cursor")
+    if cursor and not df.empty:
+        ts, review_id = _decode_cursor(cursor)
+        df = df[(df["_ts"] < ts) | ((df["_ts"] == ts) & (df["Review ID"] < review_id))]
+
+    page = df.head(limit)
+    next_cursor = None
+    if len(df) > limit:
+        last = page.iloc[-1]
+        next_cursor = _encode_cursor(last["_ts"], last["Review ID"])
+
+    fields = _list_param(params, "fields")
+    columns = [c for c in page.columns if c != "_ts"]
+    if fields:
+        unknown = [f for f in fields if f not in columns]
+        if unknown and not page.empty:
+            raise ApiError(400, f"unknown fields: {', '.join(unknown)}")
+        columns = [f for f in fields if f in columns]
+
+    return {
+        "count": len(page),
+        "next_cursor": next_cursor,
+        "reviews": page[columns].to_dict(orient="records") if not page.empty else [],
+    }
+
+
+def stars_summary(params):
+    df = load_reviews(params)
+    counts = star_counts(df)
+    return {"total": len(df), "stars": {str(s): n for s, n in counts.items()}}
+
+
+ROUTES = {
+    "/reviews": reviews_page,
+    "/stars": stars_summary,
+    "/health": lambda params: {"ok": True},
+}
+
+
+# ---------- HTTP ----------
+
+class ReviewApiHandler(BaseHTTPRequestHandler):
+    server_version = "ReviewsAPI/1.0"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        route = ROUTES.get(url.path.rstrip("/") or "/")
+        if route is None:
+            return self._send_json(404, {"error": "not found"})
+        if API_TOKEN and self.headers.get("Authorization", "") != f"Bearer {API_TOKEN}":
+            return self._send_json(401, {"error": "unauthorized"})
+
+        try:
+            payload = route(parse_qs(url.query))
+        except ApiError as e:
+            return self._send_json(e.status, {"error": str(e)})
+        except Exception as e:
+            return self._send_json(502, {"error": f"{type(e).__name__}: {e}"})
+
+        self._send_json(200, payload, conditional=True)
+
+    def _send_json(self, status: int, payload, conditional: bool = False):
+        body = json_dumps(payload)
+        etag = f'W/"{hashlib.sha1(body).hexdigest()}"'  # weak: same tag for gzip and identity
+
+        if conditional and etag in [t.strip() for t in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        headers = {"Content-Type": "application/json; charset=utf-8", "Vary": "Accept-Encoding"}
+        if conditional:
+            headers.update({"ETag": etag, "Cache-Control": "no-cache"})
+        if len(body) >= GZIP_MIN_BYTES and "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-only JSON API over store reviews.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), ReviewApiHandler)
+    print(f"Serving reviews API on http://{args.host}:{args.port}", flush=True)
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+import argparse
+import glob
+import os
+import time
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from stores import DATA_DIR, review_ids
+
+
+# ==========================================================
+# PARTITIONED REVIEW ARCHIVE (Parquet, store / app / month)
+# ==========================================================
+#
+# data/archive/store=google/app=com.example/month=2026-10/part-*.parquet
+# Every fetch appends a small file; compaction merges each partition into one
+# file sorted by time, deduped by Review ID, so row-group stats prune well.
+
+ARCHIVE_DIR = os.path.join(DATA_DIR, "archive")
+ROW_GROUP_ROWS = 10_000
+COMPACT_MIN_FILES = 8
+UNDATED_MONTH = "undated"
+UNDATED_STORES = ("microsoft", "amazon")  # their pages don't always show a parseable date
+
+FILE_SCHEMA = pa.schema([
+    ("Review ID", pa.string()),
+    ("dt_utc", pa.timestamp("us", tz="UTC")),
+    ("User Name", pa.string()),
+    ("Review Note", pa.string()),
+    ("Star", pa.int64()),
+    ("App Version", pa.string()),
+    ("Device Language", pa.string()),
+    ("Country", pa.string()),
+])
+
+PARTITION_SCHEMA = pa.schema([("store", pa.string()), ("app", pa.string()), ("month", pa.string())])
+PARTITIONING = ds.partitioning(PARTITION_SCHEMA, flavor="hive")
+
+
+def _to_archive_frame(store: str, app_id: str, raw_df: pd.DataFrame) -> pd.DataFrame:
+    df = raw_df.copy()
+    for col in FILE_SCHEMA.names:
+        if col not in df.columns:
+            df[col] = ""
+    df["Review ID"] = review_ids(df)
+
+    at = pd.to_datetime(df["dt_utc"], utc=True, errors="coerce")
+    out = pd.DataFrame({
+        "Review ID": df["Review ID"].astype(str),
+        "dt_utc": at,
+        "User Name": df["User Name"].fillna("").astype(str),
+        "Review Note": df["Review Note"].fillna("").astype(str),
+        "Star": pd.to_numeric(df["Star"], errors="coerce").astype("Int64"),
+        "App Version": df["App Version"].fillna("").astype(str),
+        "Device Language": df["Device Language"].fillna("").astype(str),
+        "Country": df["Country"].fillna("").astype(str),
+        "store": store,
+        "app": str(app_id),
+        "month": at.dt.strftime("%Y-%m").fillna(UNDATED_MONTH),
+    })
+    return out.drop_duplicates(subset=["Review ID"]).sort_values("dt_utc", na_position="last")
+
+
+def _partition_dir(store: str, app_id: str, month: str) -> str:
+    return os.path.join(ARCHIVE_DIR, f"store={store}", f"app={app_id}", f"month={month}")
+
+
+def archive_reviews(store: str, app_id: str, raw_df: pd.DataFrame) -> int:
+    if raw_df is None or raw_df.empty:
+        return 0
+
+    df = _to_archive_frame(store, app_id, raw_df)
+    table = pa.Table.from_pandas(df, schema=pa.unify_schemas([FILE_SCHEMA, PARTITION_SCHEMA]), preserve_index=False)
+    ds.write_dataset(
+        table,
+        ARCHIVE_DIR,
+        format="parquet",
+        partitioning=PARTITIONING,
+        basename_template=f"part-{time.time_ns()}-{uuid.uuid4().hex[:8]}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+        max_rows_per_group=ROW_GROUP_ROWS,
+    )
+
+    # keep touched partitions from piling up small files
+    for month in df["month"].unique():
+        path = _partition_dir(store, app_id, month)
+        if len(glob.glob(os.path.join(path, "*.parquet"))) >= COMPACT_MIN_FILES:
+            compact_partition(path)
+
+    return len(df)
+
+
+def compact_partition(path: str) -> int:
+    files = sorted(glob.glob(os.path.join(path, "*.parquet")))
+    if len(files) < 2:
+        return 0
+
+    df = ds.dataset(files, format="parquet", schema=FILE_SCHEMA).to_table().to_pandas()
+    # file names start with the write time, so the latest copy of an edited review wins
+    df = df.drop_duplicates(subset=["Review ID"], keep="last").sort_values("dt_utc", na_position="last")
+
+    tmp = os.path.join(path, f".compact-{uuid.uuid4().hex}.tmp")
+    pq.write_table(
+        pa.Table.from_pandas(df, schema=FILE_SCHEMA, preserve_index=False),
+        tmp,
+        row_group_size=ROW_GROUP_ROWS,
+        compression="zstd",
+    )
+    # named after the newest merged file so files written meanwhile still sort after it
+    newest = os.path.basename(files[-1]).split("-")[1]
+    os.replace(tmp, os.path.join(path, f"part-{newest}-{uuid.uuid4().hex[:8]}-c.parquet"))
+
+    # only the files that went into the merge; anything written meanwhile stays
+    for f in files:
+        try:
+            os.remove(f)
+        except OSError:
+            pass
+    return len(files)
+
+
+def compact_archive() -> int:
+    merged = 0
+    for path in glob.glob(os.path.join(ARCHIVE_DIR, "store=*", "app=*", "month=*")):
+        merged += compact_partition(path)
+    return merged
+
+
+def _months_between(start_dt: datetime, end_dt: datetime):
+    return [p.strftime("%Y-%m") for p in pd.period_range(start_dt.strftime("%Y-%m"), end_dt.strftime("%Y-%m"), freq="M")]
+
+
+def query_archive(store: str, app_ids, start_dt: datetime, end_dt: datetime, stars=None, countries=None, search_text: str = "",
+                  include_undated: bool = False) -> pd.DataFrame:
+    # include_undated: also return reviews without a parseable date (Microsoft/Amazon), like their fetchers do
+    if not os.path.isdir(ARCHIVE_DIR):
+        return pd.DataFrame()
+
+    dataset = ds.dataset(ARCHIVE_DIR, format="parquet", partitioning=PARTITIONING, schema=pa.unify_schemas([FILE_SCHEMA, PARTITION_SCHEMA]))
+
+    # partition pruning: only store/app/month directories in range are opened
+    expr = (ds.field("store") == store) & ds.field("app").isin([str(a) for a in app_ids])
+    months = _months_between(start_dt, end_dt) + ([UNDATED_MONTH] if include_undated else [])
+    expr &= ds.field("month").isin(months)
+
+    # row-group pruning via Parquet min/max statistics
+    in_range = (ds.field("dt_utc") >= pa.scalar(start_dt, type=pa.timestamp("us", tz="UTC")))
+    in_range &= (ds.field("dt_utc") <= pa.scalar(end_dt, type=pa.timestamp("us", tz="UTC")))
+    if include_undated:
+        in_range |= ds.field("dt_utc").is_null()
+    expr &= in_range
+    if stars:
+        expr &= ds.field("Star").isin([int(s) for s in stars])
+    if countries:
+        expr &= ds.field("Country").isin(list(countries))
+    q = (search_text or "").strip()
+    if q:
+        expr &= pc.match_substring(ds.field("Review Note"), q, ignore_case=True)
+
+    table = dataset.to_table(filter=expr, columns=FILE_SCHEMA.names + ["app"])
+    if table.num_rows == 0:
+        return pd.DataFrame()
+
+    df = table.to_pandas().drop_duplicates(subset=["Review ID"], keep="last")
+    return df.drop(columns=["Review ID"]).rename(columns={"app": "App"}).reset_index(drop=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Maintain the partitioned review archive.")
+    parser.add_argument("command", choices=["compact"])
+    parser.parse_args()
+    print(f"Compacted {compact_archive()} files.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import pandas as pd
+
+from exports import iter_chunks, write_export
+from near_duplicates import flag_near_duplicates
+from stores import standardize_table
+from themes import tag_reviews
+
+
+# ==========================================================
+# REVIEW TABLE (what a dashboard tab shows and exports)
+# ==========================================================
+#
+# app.py renders and exports through these; loadtest.py calls the same functions
+# with the widget values of a simulated session.
+
+def review_table(raw_df: pd.DataFrame, collapse_dupes=None) -> pd.DataFrame:
+    # collapse_dupes=None skips near-duplicate flagging, as on the All Stores tab
+    if raw_df is None or raw_df.empty:
+        return pd.DataFrame()
+    df = standardize_table(raw_df.copy())
+    if collapse_dupes is not None:
+        df = flag_near_duplicates(df, collapse=collapse_dupes)
+    return tag_reviews(df)
+
+
+def filtered_export(filtered: pd.DataFrame, fmt: str):
+    return write_export(iter_chunks(filtered), fmt)
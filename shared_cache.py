@@ -0,0 +1,151 @@
+import hashlib
+import importlib.util
+import logging
+import os
+import pickle
+import threading
+import time
+from datetime import datetime, timezone
+
+from stores import DATA_DIR, is_incomplete
+
+
+# ==========================================================
+# SHARED RESULT CACHE (all server processes / replicas)
+# ==========================================================
+#
+# Default backend: pickle files under data/shared_cache/, written atomically,
+# so every Streamlit process on the host shares one cache.
+# Set REVIEWS_CACHE_URL=redis://host:6379/0 to share across hosts instead
+# (needs the optional `redis` package; any Redis-compatible server works).
+# Disk entries carry their expiry as the file mtime; expired files are removed by
+# `python shared_cache.py` (cron) and by each cache_warmer run, never on a request.
+
+SHARED_CACHE_DIR = os.path.join(DATA_DIR, "shared_cache")
+SHARED_CACHE_URL = os.environ.get("REVIEWS_CACHE_URL", "")
+
+LIVE_RANGE_TTL = 15 * 60          # range reaches today: new reviews keep arriving
+FINISHED_RANGE_TTL = 24 * 3600    # range fully in the past
+STALE_TMP_SECONDS = 3600          # half-written files from crashed writers
+
+log = logging.getLogger(__name__)
+
+if SHARED_CACHE_URL and importlib.util.find_spec("redis") is None:
+    log.warning("REVIEWS_CACHE_URL is set but the redis package is not installed; using the per-host disk cache in %s.", SHARED_CACHE_DIR)
+    SHARED_CACHE_URL = ""
+
+
+def _key_digest(key) -> str:
+    return hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+
+
+# ---------- disk backend ----------
+
+def _disk_path(digest: str) -> str:
+    return os.path.join(SHARED_CACHE_DIR, digest[:2], f"{digest}.pkl")
+
+
+def _disk_get(digest: str):
+    path = _disk_path(digest)
+    try:
+        if os.path.getmtime(path) < time.time():  # expired: don't unpickle it
+            os.remove(path)
+            return None
+        with open(path, "rb") as f:
+            expires_at, value = pickle.load(f)
+    except Exception:
+        return None
+    return value if expires_at >= time.time() else None
+
+
+def _disk_set(digest: str, value, ttl: int):
+    path = _disk_path(digest)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+    expires_at = time.time() + ttl
+    with open(tmp, "wb") as f:
+        pickle.dump((expires_at, value), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.utime(tmp, (expires_at, expires_at))
+    os.replace(tmp, path)
+
+
+def prune_disk_cache() -> int:
+    # stat only: the expiry is the mtime
+    removed = 0
+    now = time.time()
+    for root, _, files in os.walk(SHARED_CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            cutoff = now - STALE_TMP_SECONDS if name.endswith(".tmp") else now
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                continue
+    return removed
+
+
+# ---------- redis backend ----------
+
+_redis_client = None
+
+
+def _redis():
+    global _redis_client
+    if _redis_client is None:
+        import redis
+        _redis_client = redis.Redis.from_url(SHARED_CACHE_URL)
+    return _redis_client
+
+
+def _redis_get(digest: str):
+    raw = _redis().get(f"reviews:{digest}")
+    return pickle.loads(raw) if raw is not None else None
+
+
+def _redis_set(digest: str, value, ttl: int):
+    _redis().set(f"reviews:{digest}", pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), ex=int(ttl))
+
+
+# ---------- public API ----------
+
+def cache_get(key):
+    try:
+        if SHARED_CACHE_URL:
+            return _redis_get(_key_digest(key))
+        return _disk_get(_key_digest(key))
+    except Exception:
+        return None  # a broken cache must never break a fetch
+
+
+def cache_set(key, value, ttl: int):
+    try:
+        if SHARED_CACHE_URL:
+            _redis_set(_key_digest(key), value, ttl)
+        else:
+            _disk_set(_key_digest(key), value, ttl)
+    except Exception:
+        pass
+
+
+def cached_call(key, ttl: int, fn, *args, **kwargs):
+    value = cache_get(key)
+    if value is not None:
+        return value
+    value = fn(*args, **kwargs)  # fetch failures raise and are never cached
+    if not is_incomplete(value):
+        cache_set(key, value, ttl)
+    return value
+
+
+def fetch_key(store: str, app_id: str, storefront: str, start_dt: datetime, end_dt: datetime):
+    return ("fetch", store, str(app_id), storefront, start_dt.isoformat(), end_dt.isoformat())
+
+
+def fetch_ttl(end_dt: datetime) -> int:
+    return LIVE_RANGE_TTL if end_dt >= datetime.now(timezone.utc) else FINISHED_RANGE_TTL
+
+
+if __name__ == "__main__":
+    print(f"Removed {prune_disk_cache()} expired cache files.")
@@ -0,0 +1,105 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from stores import (
+    MAX_STOREFRONTS,
+    GOOGLE_ALL_STOREFRONTS,
+    APPLE_COUNTRIES,
+    country_full_name,
+    fetch_google_reviews_date_range,
+    fetch_apple_reviews_country,
+    fetch_microsoft_reviews,
+    fetch_amazon_reviews,
+)
+from shared_cache import cached_call, fetch_key, fetch_ttl
+from storefront_probe import plan_storefronts, learn_from_fetch, save_probes
+
+
+# ==========================================================
+# STORE FETCH (no UI; safe to run in worker threads)
+# ==========================================================
+
+STORE_LABELS = {
+    "google": "Google Play",
+    "apple": "Apple App Store",
+    "microsoft": "Microsoft Store",
+    "amazon": "Amazon",
+}
+
+
+def _storefronts(store: str):
+    if store == "google":
+        return GOOGLE_ALL_STOREFRONTS[:MAX_STOREFRONTS] if MAX_STOREFRONTS else GOOGLE_ALL_STOREFRONTS
+    countries = APPLE_COUNTRIES[:MAX_STOREFRONTS] if MAX_STOREFRONTS else APPLE_COUNTRIES
+    return [(c, "", country_full_name(c)) for c in countries]
+
+
+def _fetch_storefront(store: str, app_id: str, country: str, lang: str, start_dt: datetime, end_dt: datetime):
+    if store == "google":
+        return fetch_google_reviews_date_range(app_id, start_dt, end_dt, lang, country)
+    return fetch_apple_reviews_country(app_id, country, start_dt, end_dt)
+
+
+def fetch_storefronts(store: str, app_id: str, start_dt: datetime, end_dt: datetime, on_progress=None):
+    # on_progress(i, total, country_name, skipped_count) before each storefront
+    storefronts, skipped = plan_storefronts(store, app_id, _storefronts(store), start_dt, end_dt)
+    frames = []
+
+    for i, (country_code, lang_code, country_name) in enumerate(storefronts, start=1):
+        if on_progress:
+            on_progress(i, len(storefronts), country_name, len(skipped))
+        try:
+            df = cached_call(
+                fetch_key(store, app_id, country_code, start_dt, end_dt), fetch_ttl(end_dt),
+                _fetch_storefront, store, app_id, country_code, lang_code, start_dt, end_dt,
+            )
+            learn_from_fetch(store, app_id, country_code, df, end_dt)
+            if not df.empty:
+                frames.append(df)
+        except Exception:
+            continue
+
+    save_probes()
+    if not frames:
+        return pd.DataFrame()
+
+    combined = pd.concat(frames, ignore_index=True)
+    return combined.drop_duplicates(subset=["User Name", "dt_utc", "Review Note"], keep="first")
+
+
+def fetch_store(store: str, app_id: str, start_dt: datetime, end_dt: datetime, on_progress=None):
+    if store in ("google", "apple"):
+        return fetch_storefronts(store, app_id, start_dt, end_dt, on_progress)
+    if store == "microsoft":
+        return cached_call(fetch_key("microsoft", app_id, "all", start_dt, end_dt), fetch_ttl(end_dt), fetch_microsoft_reviews, app_id, start_dt, end_dt)
+    return cached_call(fetch_key("amazon", app_id, "us", start_dt, end_dt), fetch_ttl(end_dt), fetch_amazon_reviews, app_id, start_dt, end_dt)
+
+
+def fetch_all_stores(ids_by_store: dict, start_dt: datetime, end_dt: datetime):
+    # one thread per store, so the wait is the slowest store, not the sum
+    results, errors = {}, {}
+    if not ids_by_store:
+        return results, errors
+
+    with ThreadPoolExecutor(max_workers=len(ids_by_store)) as pool:
+        futures = {store: pool.submit(fetch_store, store, app_id, start_dt, end_dt) for store, app_id in ids_by_store.items()}
+        for store, future in futures.items():
+            try:
+                results[store] = future.result()
+            except Exception as e:
+                errors[store] = str(e)
+                results[store] = pd.DataFrame()
+    return results, errors
+
+
+def combine_store_frames(results: dict) -> pd.DataFrame:
+    frames = []
+    for store, df in results.items():
+        if df is None or df.empty:
+            continue
+        df = df.copy()
+        df["Store"] = STORE_LABELS.get(store, store)
+        frames.append(df)
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from google_play_scraper import reviews, Sort
+
+from stores import DATA_DIR, apple_review_page, keep_apple_first_page
+
+
+# ==========================================================
+# STOREFRONT PROBING (skip storefronts with nothing in range)
+# ==========================================================
+#
+# One record per store + app + storefront:
+#     {"newest": <iso time of the newest review, or null if none>, "probed_at": <epoch>}
+# A storefront is skipped when its newest review is older than the range start
+# and the record is recent enough to trust.
+
+PROBE_FILE = os.path.join(DATA_DIR, "storefront_probes.json")
+PROBE_TTL = 6 * 3600             # trust "nothing since <newest>" for this long
+INACTIVE_TTL = 7 * 24 * 3600     # storefronts with no reviews at all
+PROBE_WORKERS = 12
+SKIP_EMPTY_STOREFRONTS = True
+
+_probe_lock = threading.Lock()
+_probes = None
+
+
+def _load_probes():
+    global _probes
+    if _probes is None:
+        try:
+            with open(PROBE_FILE, "r", encoding="utf-8") as f:
+                _probes = json.load(f)
+        except Exception:
+            _probes = {}
+    return _probes
+
+
+def _save_probes():
+    # other processes (warmer, workers, app) share the file: keep the newest record per storefront
+    probes = _load_probes()
+    try:
+        with open(PROBE_FILE, "r", encoding="utf-8") as f:
+            on_disk = json.load(f)
+    except Exception:
+        on_disk = {}
+    for key, record in on_disk.items():
+        if key not in probes or record["probed_at"] > probes[key]["probed_at"]:
+            probes[key] = record
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    tmp = f"{PROBE_FILE}.{os.getpid()}-{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(probes, f)
+    os.replace(tmp, PROBE_FILE)
+
+
+def _probe_google(package_name: str, country: str, lang: str):
+    result, _ = reviews(package_name, lang=lang, country=country, sort=Sort.NEWEST, count=1)
+    if not result or not result[0].get("at"):
+        return None
+    at = result[0]["at"]
+    return at.replace(tzinfo=timezone.utc) if at.tzinfo is None else at.astimezone(timezone.utc)
+
+
+def _probe_apple(app_id: str, country: str, lang: str):
+    # same page 1 the full fetch starts with; it is handed over instead of requested twice
+    data = apple_review_page(app_id, country, 1)
+    keep_apple_first_page(app_id, country, data)
+    for e in data.get("feed", {}).get("entry", []):
+        if "author" in e and "im:rating" in e:
+            updated = e.get("updated", {}).get("label", "")
+            return datetime.fromisoformat(updated).astimezone(timezone.utc) if updated else None
+    return None
+
+
+_PROBERS = {"google": _probe_google, "apple": _probe_apple}
+
+
+def record_newest(store: str, app_id: str, country: str, newest):
+    with _probe_lock:
+        probes = _load_probes()
+        probes[f"{store}:{app_id}:{country}"] = {
+            "newest": newest.isoformat() if newest else None,
+            "probed_at": time.time(),
+        }
+
+
+def _probe(store: str, app_id: str, country: str, lang: str):
+    try:
+        newest = _PROBERS[store](app_id, country, lang)
+    except Exception:
+        return  # unknown stays unknown, so the storefront is fetched
+    record_newest(store, app_id, country, newest)
+
+
+def _is_empty(record, start_dt: datetime, end_dt: datetime) -> bool:
+    if not record:
+        return False
+    age = time.time() - record["probed_at"]
+    if record["newest"] is None:
+        return age < INACTIVE_TTL
+    newest = datetime.fromisoformat(record["newest"])
+    probed_after_range = record["probed_at"] >= end_dt.timestamp()
+    return newest < start_dt and (probed_after_range or age < PROBE_TTL)
+
+
+def _needs_probe(record) -> bool:
+    if not record:
+        return True
+    # storefronts that never had a review are re-checked weekly, not every PROBE_TTL
+    ttl = INACTIVE_TTL if record["newest"] is None else PROBE_TTL
+    return time.time() - record["probed_at"] >= ttl
+
+
+def plan_storefronts(store: str, app_id: str, storefronts, start_dt: datetime, end_dt: datetime):
+    # storefronts: (country_code, lang_code, country_name); returns (to_fetch, skipped)
+    if not SKIP_EMPTY_STOREFRONTS:
+        return list(storefronts), []
+
+    probes = _load_probes()
+    stale = [(c, lang) for c, lang, _ in storefronts if _needs_probe(probes.get(f"{store}:{app_id}:{c}"))]
+    if stale:
+        with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as pool:
+            list(pool.map(lambda s: _probe(store, app_id, s[0], s[1]), stale))
+        with _probe_lock:
+            _save_probes()
+
+    to_fetch, skipped = [], []
+    for sf in storefronts:
+        record = probes.get(f"{store}:{app_id}:{sf[0]}")
+        (skipped if _is_empty(record, start_dt, end_dt) else to_fetch).append(sf)
+    return to_fetch, skipped
+
+
+def learn_from_fetch(store: str, app_id: str, country: str, df, end_dt: datetime):
+    # a full fetch up to "now" that found reviews is a free, exact probe
+    if df is None or df.empty or "dt_utc" not in df.columns:
+        return
+    if end_dt < datetime.now(timezone.utc):
+        return
+    newest = max(df["dt_utc"])
+    with _probe_lock:
+        record = _load_probes().get(f"{store}:{app_id}:{country}")
+    if record and record["newest"] and datetime.fromisoformat(record["newest"]) >= newest:
+        return
+    record_newest(store, app_id, country, newest)
+
+
+def save_probes():
+    with _probe_lock:
+        _save_probes()
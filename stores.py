@@ -0,0 +1,963 @@
+import os
+import re
+import pandas as pd
+import time
+import threading
+import requests
+import lxml.html
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlparse, parse_qs
+from google_play_scraper import reviews, Sort
+from themes import filter_by_themes
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+# ==========================================================
+# SETTINGS
+# ==========================================================
+
+MAX_STOREFRONTS = None  # None = FULL all storefronts, or set 20 for faster testing
+
+DATA_DIR = os.environ.get("REVIEWS_TOOL_DATA_DIR", "data")  # alerts, feeds, caches written by background jobs
+
+
+# ==========================================================
+# FETCH FAILURES (never cached, never stored as reviews)
+# ==========================================================
+
+class FetchError(RuntimeError):
+    pass  # store unreachable, non-200, unparseable page
+
+
+class FetchBlocked(FetchError):
+    pass  # captcha / bot check
+
+
+def mark_incomplete(df: pd.DataFrame) -> pd.DataFrame:
+    # some pages/markets failed: the rows are real, but the result must not be cached as final
+    df.attrs["incomplete"] = True
+    return df
+
+
+def is_incomplete(df) -> bool:
+    return isinstance(df, pd.DataFrame) and bool(df.attrs.get("incomplete"))
+
+
+# ==========================================================
+# LANGUAGE + COUNTRY HELPERS
+# ==========================================================
+
+LANGUAGE_NAMES = {
+    "en": "English",
+    "es": "Spanish",
+    "fr": "French",
+    "de": "German",
+    "it": "Italian",
+    "pt": "Portuguese",
+    "nl": "Dutch",
+    "ja": "Japanese",
+    "ko": "Korean",
+    "ru": "Russian",
+    "ar": "Arabic",
+    "tr": "Turkish",
+    "zh": "Chinese",
+    "hi": "Hindi",
+    "sv": "Swedish",
+    "da": "Danish",
+    "no": "Norwegian",
+    "fi": "Finnish",
+    "bn": "Bangla",
+    "uk": "Ukrainian",
+    "vi": "Vietnamese",
+    "id": "Indonesian",
+    "ms": "Malay",
+    "sw": "Swahili",
+    "iw": "Hebrew",
+    "cs": "Czech",
+    "sk": "Slovak",
+    "hu": "Hungarian",
+    "ro": "Romanian",
+    "bg": "Bulgarian",
+    "si": "Sinhala",
+    "ne": "Nepali",
+}
+
+COUNTRY_NAMES = {
+    "us": "United States",
+    "ca": "Canada",
+    "mx": "Mexico",
+    "gb": "United Kingdom",
+    "ie": "Ireland",
+    "fr": "France",
+    "de": "Germany",
+    "it": "Italy",
+    "es": "Spain",
+    "pt": "Portugal",
+    "nl": "Netherlands",
+    "be": "Belgium",
+    "ch": "Switzerland",
+    "at": "Austria",
+    "se": "Sweden",
+    "no": "Norway",
+    "fi": "Finland",
+    "dk": "Denmark",
+    "pl": "Poland",
+    "cz": "Czech Republic",
+    "sk": "Slovakia",
+    "hu": "Hungary",
+    "ro": "Romania",
+    "bg": "Bulgaria",
+    "ua": "Ukraine",
+    "ru": "Russia",
+    "in": "India",
+    "pk": "Pakistan",
+    "bd": "Bangladesh",
+    "np": "Nepal",
+    "lk": "Sri Lanka",
+    "id": "Indonesia",
+    "ph": "Philippines",
+    "vn": "Vietnam",
+    "th": "Thailand",
+    "my": "Malaysia",
+    "sg": "Singapore",
+    "jp": "Japan",
+    "kr": "South Korea",
+    "tw": "Taiwan",
+    "hk": "Hong Kong",
+    "tr": "Turkey",
+    "sa": "Saudi Arabia",
+    "ae": "United Arab Emirates",
+    "eg": "Egypt",
+    "il": "Israel",
+    "za": "South Africa",
+    "ng": "Nigeria",
+    "ke": "Kenya",
+    "br": "Brazil",
+    "ar": "Argentina",
+    "cl": "Chile",
+    "co": "Colombia",
+    "pe": "Peru",
+    "au": "Australia",
+    "nz": "New Zealand",
+}
+
+
+def lang_full_name(code: str) -> str:
+    if not code:
+        return ""
+    code = code.split("-")[0].lower().strip()
+    return LANGUAGE_NAMES.get(code, code)
+
+
+def country_full_name(code: str) -> str:
+    if not code:
+        return ""
+    code = code.lower().strip()
+    return COUNTRY_NAMES.get(code, code.upper())
+
+
+# ==========================================================
+# TABLE HELPERS
+# ==========================================================
+
+def star_counts(df: pd.DataFrame):
+    counts = {s: 0 for s in [1, 2, 3, 4, 5]}
+    if df.empty or "Star" not in df.columns:
+        return counts
+    vc = df["Star"].value_counts(dropna=False).to_dict()
+    for s in counts.keys():
+        counts[s] = int(vc.get(s, 0))
+    return counts
+
+
+def apply_filters(df: pd.DataFrame, star_filter, search_text: str, theme_filter=None, countries=None):
+    filtered = df.copy()
+    if filtered.empty:
+        return filtered
+
+    if "Star" in filtered.columns and star_filter:
+        filtered = filtered[filtered["Star"].isin(star_filter)]
+
+    q = (search_text or "").strip().lower()
+    if q:
+        note = filtered.get("Review Note", pd.Series([""] * len(filtered))).fillna("").astype(str).str.lower()
+        filtered = filtered[note.str.contains(re.escape(q), regex=True)]
+
+    if "Country" in filtered.columns and countries:
+        filtered = filtered[filtered["Country"].isin(countries)]
+
+    if theme_filter:
+        filtered = filter_by_themes(filtered, theme_filter)
+
+    return filtered
+
+
+def parse_date_range(date_range):
+    def flatten_once(x):
+        if isinstance(x, (list, tuple)) and len(x) == 1 and isinstance(x[0], (list, tuple)):
+            return x[0]
+        return x
+
+    prev = None
+    while prev != date_range:
+        prev = date_range
+        date_range = flatten_once(date_range)
+
+    if isinstance(date_range, (list, tuple)) and len(date_range) == 2:
+        start_date, end_date = date_range
+    else:
+        start_date = date_range
+        end_date = date_range
+
+    while isinstance(start_date, (list, tuple)):
+        start_date = start_date[0]
+    while isinstance(end_date, (list, tuple)):
+        end_date = end_date[-1]
+
+    start_dt = datetime.combine(start_date, datetime.min.time()).replace(tzinfo=timezone.utc)
+    end_dt = datetime.combine(end_date, datetime.max.time()).replace(tzinfo=timezone.utc)
+
+    start_label = start_date.strftime("%d %B, %Y")
+    end_label = end_date.strftime("%d %B, %Y")
+    days_selected = (end_date - start_date).days + 1
+    range_label = f"{start_label} - {end_label}"
+
+    return start_dt, end_dt, range_label, days_selected
+
+
+def format_datetime(dt: datetime) -> str:
+    # undated rows (Microsoft/Amazon) turn into NaT once the column is datetime64
+    if dt is None or pd.isna(dt) or dt == "":
+        return ""
+    dt_local = dt.astimezone(timezone.utc)
+    date_part = dt_local.strftime("%d %B, %Y")
+    time_part = dt_local.strftime("%I:%M %p").lstrip("0")
+    return f"{date_part} - {time_part}"
+
+
+def review_ids(df: pd.DataFrame) -> pd.Series:
+    # same identity the fetchers dedupe on
+    key = df[["User Name", "dt_utc", "Review Note"]].astype(str)
+    return pd.util.hash_pandas_object(key, index=False).astype(str)
+
+
+TABLE_COLUMNS = [
+    "Date & Time",
+    "User Name",
+    "Review Note",
+    "Star",
+    "App Version",
+    "Device Language",
+    "Country",
+    "Review ID",
+]
+
+
+def standardize_table(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+
+    for col in ["User Name", "Review Note", "Star", "App Version", "Device Language", "Country", "dt_utc"]:
+        if col not in df.columns:
+            df[col] = ""
+
+    df["Review ID"] = review_ids(df)
+    df["Date & Time"] = df["dt_utc"].apply(format_datetime)
+    df = df.sort_values("dt_utc", ascending=False).reset_index(drop=True)
+
+    final_cols = list(TABLE_COLUMNS)
+    if "App" in df.columns:  # multi-app results, e.g. archive queries
+        final_cols.insert(0, "App")
+    if "Store" in df.columns:  # combined all-stores results
+        final_cols.insert(0, "Store")
+    return df[final_cols]
+
+
+# ==========================================================
+# GLOBAL CATEGORY + APP LISTS
+# ==========================================================
+
+CATEGORIES = ["Kids Games", "Parents Games", "Applications"]
+
+GOOGLE_APPS = {
+    "Kids Games": {
+            "ABC Kids: Tracing & Phonics": "com.rvappstudios.abc_kids_toddler_tracing_phonics",
+            "Spelling & Phonics: Kids Games": "com.rvappstudios.abc.spelling.toddler.spell.phonics",
+            "123 Numbers - Count & Tracing": "com.rvappstudios.numbers123.toddler.counting.tracing",
+            "Puzzle Kids: Jigsaw Puzzles": "com.rvappstudios.jigsaw.puzzles.kids",
+            "Math Kids: Math Games For Kids": "com.rvappstudios.math.kids.counting",
+            "Color Kids: Coloring Games": "com.rvappstudios.shapes.colors.toddler",
+            "Kids Multiplication Math Games": "com.rvappstudios.kids.multiplication.games.multiply.math",
+            "Baby Games: Piano & Baby Phone": "com.rvappstudios.baby.games.piano.phone.kids",
+            "Coloring Games: Color & Paint": "com.rvappstudios.kids.coloring.book.color.painting",
+            "Learn to Read: Kids Games": "com.rvappstudios.sight.words.phonics.reading.kids.games",
+            "Math Games: Math for Kids": "com.rvappstudios.math.games.kids.addition.subtraction.multiplication.division",
+            "Kids Math: Math Games for Kids": "com.rvappstudios.montessori.math.games.kids.number.counting",
+            "Drawing Games: Draw & Color": "com.rvappstudios.kids.drawing.games.coloring.book.paint",
+            "Kids Games: For Toddlers 3-5": "com.rvappstudios.baby.toddler.kids.games.learning.activity",
+            "Kids Toddler & Preschool Games": "com.rvappstudios.toddler.preschool.kids.learning.games",
+            "Baby Phone & Kids Games": "com.rvappstudios.baby.phone.kids.games.toddler.learning.apps.lucas.and.friends",
+            "Kids Music: Piano, Xylo, Drums": "com.rvappstudios.kids.games.music.baby.piano.songs.lucas.and.friends",
+    },
+    "Parents Games": {
+"Balloon Pop: Match 3 Games": "com.rvappstudios.match3_balloon_puzzle_game",
+"Basketball Games: Hoop Puzzles": "com.rvappstudios.basketball",
+"Block Puzzle: Block Games": "com.rvappstudios.block.jigsaw.puzzle.game.hexa.color",
+"Block Puzzles: Hexa Block Game": "com.rvappstudios.block.puzzle.games.classic.board",
+"Bloody Monsters: Bouncy Bullet": "com.rvappstudios.bloodymonsters",
+"Bubble Crusher: Bubble Pop": "com.rvappstudios.bubblecrusher2",
+"Bubble Pop: Bubble Shooter": "com.rvappstudios.bubble.shooter.shoot.bubbles",
+"Bubble Shooter: Pastry Pop": "com.rvappstudios.bubble.pop.bubble.shooter.puzzle.game.match3",
+"Cake Blast: Match 3 Games": "com.rvappstudios.cake.match3.puzzle.game",
+"Christmas Cookie: Match 3 Game": "com.rvappstudios.christmascookie",
+"Dice Puzzle - Dice Merge Game": "com.rvappstudios.dice.games.merge.puzzle",
+"Find The Difference: Find It": "com.rvappstudios.find.odd.one.out.spot.puzzle.game",
+"Find The Differences - Spot it": "com.rvappstudios.puzzle.game.find.difference.ftd",
+"Finger Slayer": "com.rvappstudios.fingerslayer",
+"Fruit Cube Blast": "com.rvappstudios.tap.blast.match3.puzzle",
+"Gummy Paradise: Match 3 Games": "com.rvappstudios.gummy.paradise.drag.match",
+"Ice Cream Paradise: Match 3": "com.rvappstudios.ice.cream.paradise.match3",
+"Jewel Gems: Jewel Games": "com.rvappstudios.jewel.gem.tap.cube.blast.puzzle.match3.game",
+"Jigsaw Puzzles Blocks": "com.rvappstudios.tangram.jigsaw.puzzles.block.game",
+"Jigsaw Puzzles Hexa": "com.rvappstudios.hexa.jigsaw.puzzle.block.game",
+"Jigsaw Puzzles: Picture Puzzle": "com.rvappstudios.jigsaw.puzzles",
+"Match Tiles: Block Puzzle Game": "com.rvappstudios.tile.match3.block.puzzle.game",
+"Maze Games: Labyrinth Puzzles": "com.rvappstudios.maze.games.puzzle.mazes.labyrinth",
+"Onnet Connect: Tile Matching": "com.rvappstudios.tile.connect.link.puzzle.game",
+"Puzzles: Jigsaw Puzzle Games": "com.rvappstudios.jigsaw.puzzles.picture.block.games",
+"Tangram Puzzle: Polygrams Game": "com.rvappstudios.tangram.blocks.puzzle.brain.games",
+"Tile Puzzle Game: Tiles Match": "com.rvappstudios.tile.match.tiles.puzzle.game",
+"Veggies Cut: Logic Puzzle Game": "com.rvappstudios.veggies.cut.logic.puzzle.adult.game",
+"Word Pics - Word Games": "com.rvappstudios.two.pics.one.word.puzzle.game",
+"Word Puzzle: Word Games": "com.rvappstudios.four.pics.one.word.pic.to.words.puzzle.game",
+"Word Search Games: Word Find": "com.rvappstudios.word.search.puzzle.game",
+"Word Spin: Word Games": "com.rvappstudios.pic.word.games.guess.picture.puzzle",
+"Zombie Heroes: Zombie Games": "com.rvappstudios.lastheroes",
+"Zombie Ragdoll - Zombie Games": "com.rvappstudios.zombieragdoll",
+"Zombie Shooting: Archery Games": "com.rvappstudios.archeryblitz1",
+"Zombie Slice: Zombie Games": "com.rvappstudios.zombiecarnage",
+},
+    "Applications": {
+"Alarm Clock: Mornings & Naps": "com.rvappstudios.alarm.clock.smart.sleep.timer.music",
+"App Locker: Privacy Apps Lock": "com.rvappstudios.applock.protect.lock.app",
+"Digital Compass: Map & GPS": "com.rvappstudios.compass.offline.direction",
+"Flash Alerts LED - Call, SMS": "com.rvappstudios.Flash.Alerts.LED.Call.SMS.Flashlight",
+"Flashlight: Torch Light": "com.rvappstudios.flashlight",
+"Kids App Lock: Parental Lock": "com.rvappstudios.child.lock.kids.parental.control.free",
+"Magnifying Glass + Flashlight": "com.rvappstudios.magnifyingglass",
+"Mirror: Beauty Camera": "com.rvappstudios.mirror",
+"QR Scanner and Generator": "com.rvappstudios.qr.barcode.scanner.reader.generator",
+"Sleep Timer: Turn Music Off": "com.rvappstudios.sleep.timer.off.music.relax",
+"Smart Calc: Daily Calculator": "com.rvappstudios.calculator.free.app",
+"Stopwatch and Timer": "com.rvappstudios.timer.multiple.alarm.stopwatch",
+    }
+}
+
+APPLE_APPS = {
+    "Kids Games": {
+        "ABC Kids: Tracing & Phonics": "1112482869",
+        "Spelling & Phonics: Kids Games": "1186728253",
+        "123 Numbers - Count & Tracing": "1210356444",
+        "Puzzle Kids: Jigsaw Puzzles": "1244400052",
+        "Math Kids: Math Games For Kids": "1272098657",
+        "Color Kids: Coloring Games": "1272085786",
+        "Kids Multiplication Math Games": "1455322707",
+        "Baby Games: Piano & Baby Phone": "1455967837",
+        "Coloring Games: Color & Paint": "1480696573",
+        "Learn to Read: Kids Games": "1498466300",
+        "Math Games: Math for Kids": "1525694602",
+        "Kids Math: Math Games for Kids": "1565484251",
+        "Drawing Games: Draw & Color": "1547228861",
+        "Kids Games: For Toddlers 3-5": "1613310657",
+        "Kids Toddler & Preschool Games": "6472886437",
+        "Baby Phone & Kids Games": "id6744884306",
+        "Kids Music: Piano, Xylo, Drums": "6747074172",
+    },
+    "Parents Games": {
+        "Jigsaw Puzzles: Photo Puzzles": "1440151043",
+        "Find The Differences: Spot It": "1475757108",
+    },
+    "Applications": {
+        "Best Flash Light - Flashlight": "429177928",
+        "Magnifying Glass + Flashlight": "908717824",
+        "Alarm Clock ◎": "450993079",
+    }
+}
+
+MICROSOFT_APPS = {
+    "Kids Games": {
+        "Coloring Games (Microsoft Store)": "9phq2rx60xgr",
+    },
+    "Parents Games": {},
+    "Applications": {}
+}
+
+AMAZON_APPS = {
+    "Kids Games": {
+        "Coloring Games (Amazon)": "B08156J9VN",
+    },
+    "Parents Games": {},
+    "Applications": {}
+}
+
+# Store listings with a different title for the same app -> the Google Play / App Store label
+# store listing name -> the Google Play label it is merged under
+APP_LABEL_ALIASES = {
+    "Coloring Games (Microsoft Store)": "Coloring Games: Color & Paint",
+    "Coloring Games (Amazon)": "Coloring Games: Color & Paint",
+    "Jigsaw Puzzles: Photo Puzzles": "Jigsaw Puzzles: Picture Puzzle",
+    "Find The Differences: Spot It": "Find The Differences - Spot it",
+    "Best Flash Light - Flashlight": "Flashlight: Torch Light",
+    "Alarm Clock ◎": "Alarm Clock: Mornings & Naps",
+}
+
+
+def app_identities(category: str):
+    # label -> {store: app id}, for every app listed in at least one store
+    identities = {}
+    catalogs = [("google", GOOGLE_APPS), ("apple", APPLE_APPS), ("microsoft", MICROSOFT_APPS), ("amazon", AMAZON_APPS)]
+    for store, catalog in catalogs:
+        for label, app_id in catalog.get(category, {}).items():
+            identities.setdefault(APP_LABEL_ALIASES.get(label, label), {})[store] = app_id
+    return identities
+
+
+# ==========================================================
+# FULL STOREFRONTS LIST (60+)
+# ==========================================================
+
+GOOGLE_ALL_STOREFRONTS = [
+    ("us", "en", "United States"),
+    ("ca", "en", "Canada"),
+    ("mx", "es", "Mexico"),
+    ("gb", "en", "United Kingdom"),
+    ("ie", "en", "Ireland"),
+    ("fr", "fr", "France"),
+    ("de", "de", "Germany"),
+    ("it", "it", "Italy"),
+    ("es", "es", "Spain"),
+    ("pt", "pt", "Portugal"),
+    ("nl", "nl", "Netherlands"),
+    ("be", "fr", "Belgium"),
+    ("ch", "de", "Switzerland"),
+    ("at", "de", "Austria"),
+    ("se", "sv", "Sweden"),
+    ("no", "no", "Norway"),
+    ("fi", "fi", "Finland"),
+    ("dk", "da", "Denmark"),
+    ("pl", "pl", "Poland"),
+    ("cz", "cs", "Czech Republic"),
+    ("sk", "sk", "Slovakia"),
+    ("hu", "hu", "Hungary"),
+    ("ro", "ro", "Romania"),
+    ("bg", "bg", "Bulgaria"),
+    ("ua", "uk", "Ukraine"),
+    ("ru", "ru", "Russia"),
+    ("in", "en", "India"),
+    ("pk", "en", "Pakistan"),
+    ("bd", "bn", "Bangladesh"),
+    ("np", "ne", "Nepal"),
+    ("lk", "si", "Sri Lanka"),
+    ("id", "id", "Indonesia"),
+    ("ph", "en", "Philippines"),
+    ("vn", "vi", "Vietnam"),
+    ("th", "th", "Thailand"),
+    ("my", "ms", "Malaysia"),
+    ("sg", "en", "Singapore"),
+    ("jp", "ja", "Japan"),
+    ("kr", "ko", "South Korea"),
+    ("tw", "zh", "Taiwan"),
+    ("hk", "zh", "Hong Kong"),
+    ("tr", "tr", "Turkey"),
+    ("sa", "ar", "Saudi Arabia"),
+    ("ae", "ar", "United Arab Emirates"),
+    ("eg", "ar", "Egypt"),
+    ("il", "iw", "Israel"),
+    ("za", "en", "South Africa"),
+    ("ng", "en", "Nigeria"),
+    ("ke", "sw", "Kenya"),
+    ("br", "pt", "Brazil"),
+    ("ar", "es", "Argentina"),
+    ("cl", "es", "Chile"),
+    ("co", "es", "Colombia"),
+    ("pe", "es", "Peru"),
+    ("au", "en", "Australia"),
+    ("nz", "en", "New Zealand"),
+]
+
+APPLE_COUNTRIES = [c for c, _, _ in GOOGLE_ALL_STOREFRONTS]
+
+
+# ==========================================================
+# GOOGLE PLAY FUNCTIONS
+# ==========================================================
+
+def package_from_play_url(play_url: str) -> str:
+    qs = parse_qs(urlparse(play_url).query)
+    if "id" in qs and qs["id"]:
+        return qs["id"][0]
+    m = re.search(r"[?&]id=([^&]+)", play_url)
+    if m:
+        return m.group(1)
+    raise ValueError("Could not find package id in URL. Must include ?id=com.example.app")
+
+
+def fetch_google_reviews_date_range(package_name: str, start_dt: datetime, end_dt: datetime, lang: str, country: str, max_pages: int = 50):
+    rows = []
+    token = None
+    pages = 0
+
+    while pages < max_pages:
+        result, token = reviews(
+            package_name,
+            lang=lang,
+            country=country,
+            sort=Sort.NEWEST,
+            count=200,
+            continuation_token=token,
+        )
+        pages += 1
+
+        if not result:
+            break
+
+        stop = False
+        for r in result:
+            at = r.get("at")
+            if not at:
+                continue
+
+            at = at.replace(tzinfo=timezone.utc) if at.tzinfo is None else at.astimezone(timezone.utc)
+
+            if at < start_dt:
+                stop = True
+                continue
+            if at > end_dt:
+                continue
+
+            rows.append(
+                {
+                    "dt_utc": at,
+                    "User Name": r.get("userName") or "",
+                    "Review Note": r.get("content") or "",
+                    "Star": r.get("score"),
+                    "App Version": r.get("reviewCreatedVersion") or "",
+                    "Device Language": lang_full_name(lang),
+                    "Country": country_full_name(country),
+                }
+            )
+
+        if stop or token is None:
+            break
+
+    return pd.DataFrame(rows)
+
+
+# ==========================================================
+# APPLE FUNCTIONS
+# ==========================================================
+
+def apple_app_id_from_url(url: str) -> str:
+    m = re.search(r"/id(\d+)", url)
+    if not m:
+        raise ValueError("Could not find Apple App ID. URL must include /id123456789")
+    return m.group(1)
+
+
+APPLE_PAGE_REUSE_SECONDS = 300  # page 1 fetched by the storefront probe, reused by the full fetch
+
+# (app_id, country) -> (fetched_at, parsed page 1)
+_apple_first_pages = {}
+
+
+def apple_review_page(app_id: str, country: str, page: int):
+    url = f"https://itunes.apple.com/{country}/rss/customerreviews/page={page}/id={app_id}/sortby=mostrecent/json"
+    resp = requests.get(url, timeout=20)
+    if resp.status_code != 200:
+        raise FetchError(f"Apple {country} page {page}: HTTP {resp.status_code}")
+    return json_loads(resp.content)
+
+
+def keep_apple_first_page(app_id: str, country: str, data):
+    now = time.time()
+    for key, (fetched_at, _) in list(_apple_first_pages.items()):
+        if now - fetched_at >= APPLE_PAGE_REUSE_SECONDS:
+            _apple_first_pages.pop(key, None)
+    _apple_first_pages[(app_id, country)] = (now, data)
+
+
+def _take_apple_first_page(app_id: str, country: str):
+    fetched_at, data = _apple_first_pages.pop((app_id, country), (0, None))
+    return data if time.time() - fetched_at < APPLE_PAGE_REUSE_SECONDS else None
+
+
+def _label(e, field: str) -> str:
+    return e.get(field, {}).get("label", "") or ""
+
+
+def _parse_apple_page(entries, country: str, start_dt: datetime, end_dt: datetime):
+    # returns (rows in range, whether the page reached reviews older than start_dt)
+    records = [
+        (
+            _label(e, "updated"),
+            _label(e, "title"),
+            _label(e, "content"),
+            e.get("author", {}).get("name", {}).get("label", "") or "",
+            _label(e, "im:rating"),
+            _label(e, "im:version"),
+        )
+        for e in entries
+        if "author" in e and "im:rating" in e
+    ]
+    if not records:
+        return pd.DataFrame(), False
+
+    page = pd.DataFrame.from_records(records, columns=["updated", "title", "note", "User Name", "Star", "App Version"])
+    at = pd.to_datetime(page["updated"], utc=True, errors="coerce", format="ISO8601")
+
+    # feed is newest first: everything from the first review older than start_dt on is dropped
+    older = (at < start_dt).to_numpy()
+    reached_start = bool(older.any())
+    if reached_start:
+        first_old = int(older.argmax())
+        page, at = page.iloc[:first_old], at.iloc[:first_old]
+
+    keep = at.notna() & (at <= end_dt)
+    page, at = page[keep], at[keep]
+    if page.empty:
+        return pd.DataFrame(), reached_start
+
+    merged_note = (page["title"] + "\n\n" + page["note"]).str.strip().where(page["title"] != "", page["note"])
+
+    df = pd.DataFrame(
+        {
+            "dt_utc": at,
+            "User Name": page["User Name"],
+            "Review Note": merged_note,
+            "Star": pd.to_numeric(page["Star"], errors="coerce").fillna(0).astype(int),
+            "App Version": page["App Version"],
+            "Device Language": "",
+            "Country": country_full_name(country),
+        }
+    )
+    return df.reset_index(drop=True), reached_start
+
+
+def fetch_apple_reviews_country(app_id: str, country: str, start_dt: datetime, end_dt: datetime, max_pages: int = 10):
+    frames = []
+    for page in range(1, max_pages + 1):
+        try:
+            data = _take_apple_first_page(app_id, country) if page == 1 else None
+            if data is None:
+                data = apple_review_page(app_id, country, page)
+        except Exception as e:
+            if not frames:
+                raise e if isinstance(e, FetchError) else FetchError(f"Apple {country} page {page}: {e}")
+            return mark_incomplete(pd.concat(frames, ignore_index=True))
+
+        entries = data.get("feed", {}).get("entry", [])
+        if not entries or len(entries) <= 1:
+            break
+
+        df, reached_start = _parse_apple_page(entries, country, start_dt, end_dt)
+        if not df.empty:
+            frames.append(df)
+        if reached_start:
+            break
+
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+# ==========================================================
+# MICROSOFT + AMAZON (best effort)
+# ==========================================================
+
+def microsoft_product_id_from_url(url: str) -> str:
+    m = re.search(r"/detail/([A-Za-z0-9]{6,})", url)
+    if not m:
+        raise ValueError("Could not find Microsoft Product ID. Must include /detail/<id>")
+    return m.group(1)
+
+
+MICROSOFT_MARKETS = [
+    ("en-us", "us"),
+    ("en-gb", "gb"),
+    ("en-ca", "ca"),
+    ("en-au", "au"),
+    ("en-in", "in"),
+    ("en-ie", "ie"),
+    ("en-nz", "nz"),
+    ("en-sg", "sg"),
+    ("en-za", "za"),
+    ("en-ph", "ph"),
+]  # English hl only: the star text we parse is "N out of 5"
+
+MICROSOFT_MAX_WORKERS = 6
+
+# innermost review div that carries a rating (outer wrappers also match the class)
+_MS_REVIEW_DIV = "div[contains(translate(@class, 'REVIEW', 'review'), 'review')][contains(string(.), 'out of 5')]"
+_MS_REVIEW_XPATH = f"//{_MS_REVIEW_DIV}[not(.//{_MS_REVIEW_DIV})]"
+
+# rating, date and button text around the body; the date format differs per market
+_MS_CHROME_RE = re.compile(
+    r"\b(?:rated\s+)?\d\s*out of 5(?:\s*stars?)?"
+    r"|\b\d{1,2}/\d{1,2}/\d{4}\b"
+    r"|\b(?:january|february|march|april|may|june|july|august|september|october|november|december) \d{1,2}, \d{4}\b"
+    r"|\bwas this (?:review )?helpful\??",
+    re.I,
+)
+
+
+def _microsoft_review_body(txt: str) -> str:
+    return re.sub(r"\s+", " ", _MS_CHROME_RE.sub(" ", txt)).strip(" .,|-")
+
+
+def _microsoft_review_date(txt: str, hl: str):
+    m = re.search(r"\b(\d{1,2})/(\d{1,2})/(\d{4})\b", txt)
+    if m:
+        a, b, year = (int(g) for g in m.groups())
+        orders = [(a, b), (b, a)] if hl == "en-us" else [(b, a), (a, b)]
+        for month, day in orders:
+            try:
+                return datetime(year, month, day, tzinfo=timezone.utc)
+            except ValueError:
+                continue
+        return None
+
+    m = re.search(r"\b([A-Z][a-z]+ \d{1,2}, \d{4})\b", txt)
+    if m:
+        try:
+            return datetime.strptime(m.group(1), "%B %d, %Y").replace(tzinfo=timezone.utc)
+        except ValueError:
+            return None
+
+    return None
+
+
+def fetch_microsoft_reviews_market(product_id: str, hl: str, gl: str, start_dt: datetime = None, end_dt: datetime = None):
+    rows = []
+    headers = {"User-Agent": "Mozilla/5.0"}
+
+    url = f"https://apps.microsoft.com/detail/{product_id}?hl={hl}&gl={gl}"
+
+    try:
+        r = requests.get(url, headers=headers, timeout=25)
+    except Exception as e:
+        raise FetchError(f"Microsoft {hl}: {e}")
+    if r.status_code != 200:
+        raise FetchError(f"Microsoft {hl}: HTTP {r.status_code}")
+    try:
+        tree = lxml.html.fromstring(r.content)
+    except Exception as e:
+        raise FetchError(f"Microsoft {hl}: {e}")
+
+    for rb in tree.xpath(_MS_REVIEW_XPATH):
+        txt = " ".join(t.strip() for t in rb.itertext() if t.strip())
+        mstar = re.search(r"(\d)\s*out of 5", txt)
+        if not mstar:
+            continue
+        star = int(mstar.group(1))
+
+        at = _microsoft_review_date(txt, hl)
+        if at and start_dt and at < start_dt:
+            continue
+        if at and end_dt and at > end_dt:
+            continue
+
+        rows.append(
+            {
+                "dt_utc": at,
+                "User Name": "",  # the page shows no reviewer name; dedupe relies on star + date + body
+                "Review Note": _microsoft_review_body(txt),
+                "Star": star,
+                "App Version": "",
+                "Device Language": lang_full_name(hl),
+                "Country": country_full_name(gl),
+            }
+        )
+
+    return pd.DataFrame(rows)
+
+
+def fetch_microsoft_reviews(product_id: str, start_dt: datetime = None, end_dt: datetime = None, markets=None):
+    markets = markets or MICROSOFT_MARKETS
+
+    def fetch_market(m):
+        try:
+            return fetch_microsoft_reviews_market(product_id, m[0], m[1], start_dt, end_dt)
+        except FetchError as e:
+            return e
+
+    with ThreadPoolExecutor(max_workers=min(MICROSOFT_MAX_WORKERS, len(markets))) as pool:
+        results = list(pool.map(fetch_market, markets))
+
+    errors = [r for r in results if isinstance(r, FetchError)]
+    if len(errors) == len(results):
+        raise errors[0]
+
+    frames = [f for f in results if not isinstance(f, FetchError) and not f.empty]
+    combined = pd.DataFrame()
+    if frames:
+        combined = pd.concat(frames, ignore_index=True)
+        # the same review is listed in every market; only the date format differs
+        combined = combined.drop_duplicates(subset=["Star", "dt_utc", "Review Note"], keep="first")
+    return mark_incomplete(combined) if errors else combined
+
+
+def amazon_asin_from_url(url: str) -> str:
+    m = re.search(r"/dp/([A-Z0-9]{10})", url)
+    if not m:
+        raise ValueError("Could not find Amazon ASIN. Must include /dp/BXXXXXXXXX")
+    return m.group(1)
+
+
+AMAZON_HOST = "www.amazon.com"
+AMAZON_MAX_WORKERS = 3
+AMAZON_MIN_DELAY = 1.5       # seconds between requests to the host, grows after a captcha
+AMAZON_MAX_DELAY = 20.0
+AMAZON_BLOCK_COOLDOWN = 30   # x current delay: how long the host is left alone after a captcha
+AMAZON_PAGE_CACHE_TTL = 3600
+
+_AMAZON_BLOCK_RE = re.compile(rb"captcha|robot check", re.I)
+
+_amazon_lock = threading.Lock()
+_AMAZON_HOST_STATE = {}   # host -> {"next_at", "delay", "blocked_until"}
+_AMAZON_PAGE_CACHE = {}   # (asin, page) -> (fetched_at, rows)
+
+
+def _amazon_host_state(host: str):
+    return _AMAZON_HOST_STATE.setdefault(host, {"next_at": 0.0, "delay": AMAZON_MIN_DELAY, "blocked_until": 0.0})
+
+
+def _amazon_wait_turn(host: str) -> bool:
+    with _amazon_lock:
+        state = _amazon_host_state(host)
+        now = time.monotonic()
+        if now < state["blocked_until"]:
+            return False
+        wait = max(0.0, state["next_at"] - now)
+        state["next_at"] = max(now, state["next_at"]) + state["delay"]
+
+    if wait:
+        time.sleep(wait)
+    return True
+
+
+def _amazon_report(host: str, blocked: bool):
+    with _amazon_lock:
+        state = _amazon_host_state(host)
+        if blocked:
+            state["delay"] = min(state["delay"] * 2, AMAZON_MAX_DELAY)
+            state["blocked_until"] = time.monotonic() + state["delay"] * AMAZON_BLOCK_COOLDOWN
+        else:
+            state["delay"] = max(state["delay"] * 0.8, AMAZON_MIN_DELAY)
+
+
+def _amazon_review_date(txt: str):
+    m = re.search(r"on ([A-Z][a-z]+ \d{1,2}, \d{4})", txt)
+    if not m:
+        return None
+    try:
+        return datetime.strptime(m.group(1), "%B %d, %Y").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
+
+def _parse_amazon_page(content: bytes):
+    rows = []
+    tree = lxml.html.fromstring(content)
+
+    for b in tree.xpath("//div[@data-hook='review']"):
+        star = ""
+        star_txt = b.xpath("string(.//i[@data-hook='review-star-rating']//span)")
+        mstar = re.search(r"(\d+(\.\d+)?)", star_txt)
+        if mstar:
+            star = int(float(mstar.group(1)))
+
+        text = " ".join(b.xpath("string(.//span[@data-hook='review-body'])").split())
+
+        rows.append(
+            {
+                "dt_utc": _amazon_review_date(b.xpath("string(.//span[@data-hook='review-date'])")),
+                "User Name": b.xpath("string(.//span[@class='a-profile-name'])").strip(),
+                "Review Note": text,
+                "Star": star,
+                "App Version": "",
+                "Device Language": "",
+                "Country": "United States",
+            }
+        )
+
+    return rows
+
+
+def _fetch_amazon_page(asin: str, page: int):
+    # returns (rows, blocked); rows is None when the page could not be fetched
+    cached = _AMAZON_PAGE_CACHE.get((asin, page))
+    if cached and time.time() - cached[0] < AMAZON_PAGE_CACHE_TTL:
+        return cached[1], False
+
+    if not _amazon_wait_turn(AMAZON_HOST):
+        return None, True
+
+    headers = {"User-Agent": "Mozilla/5.0", "Accept-Language": "en-US,en;q=0.9"}
+    url = f"https://{AMAZON_HOST}/product-reviews/{asin}/?pageNumber={page}"
+
+    try:
+        r = requests.get(url, headers=headers, timeout=25)
+        if r.status_code != 200:
+            return None, False
+    except Exception:
+        return None, False
+
+    if _AMAZON_BLOCK_RE.search(r.content):
+        _amazon_report(AMAZON_HOST, blocked=True)
+        return None, True
+    _amazon_report(AMAZON_HOST, blocked=False)
+
+    try:
+        rows = _parse_amazon_page(r.content)
+    except Exception:
+        return None, False
+
+    _AMAZON_PAGE_CACHE[(asin, page)] = (time.time(), rows)
+    return rows, False
+
+
+def fetch_amazon_reviews(asin: str, start_dt: datetime = None, end_dt: datetime = None, max_pages: int = 3):
+    pages = list(range(1, max_pages + 1))
+    with ThreadPoolExecutor(max_workers=min(AMAZON_MAX_WORKERS, len(pages))) as pool:
+        results = list(pool.map(lambda p: _fetch_amazon_page(asin, p), pages))
+
+    rows = []
+    failed = blocked = False
+    for page_rows, page_blocked in results:
+        if page_rows is None:
+            failed, blocked = True, page_blocked
+            break
+        if not page_rows:
+            break  # keep pages in order: stop at the first empty page
+        rows.extend(page_rows)
+
+    if failed and not rows:
+        if blocked:
+            raise FetchBlocked("Amazon blocked the request (captcha/bot check). Use Amazon Product Advertising API for stable results.")
+        raise FetchError("Amazon: review page could not be fetched.")
+
+    df = pd.DataFrame(rows)
+    if df.empty:
+        return mark_incomplete(df) if failed else df
+
+    # undated rows are kept, as before
+    at = pd.to_datetime(df["dt_utc"], utc=True, errors="coerce")
+    keep = pd.Series(True, index=df.index)
+    if start_dt:
+        keep &= at.isna() | (at >= start_dt)
+    if end_dt:
+        keep &= at.isna() | (at <= end_dt)
+    out = df[keep].reset_index(drop=True)
+    return mark_incomplete(out) if failed else out
@@ -0,0 +1,30 @@
+import pytest
+
+import app_metadata
+
+
+@pytest.fixture
+def metadata_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_metadata, "METADATA_DIR", str(tmp_path))
+    monkeypatch.setattr(app_metadata, "ICON_DIR", str(tmp_path / "icons"))
+    monkeypatch.setattr(app_metadata, "SHARED_CACHE_URL", "")
+    monkeypatch.setattr(app_metadata, "_memory_cache", {})
+    return tmp_path
+
+
+def test_failed_refresh_keeps_last_good_metadata(metadata_dir, monkeypatch):
+    good = {"title": "Good Title", "icon_url": "", "score": 4.5, "ratings": 10, "histogram": None}
+    monkeypatch.setitem(app_metadata._INFO_FETCHERS, "google", lambda app_id: good)
+    app_metadata.get_app_info("google", "pkg")
+
+    def down(app_id):
+        raise ConnectionError("network blip")
+
+    monkeypatch.setitem(app_metadata._INFO_FETCHERS, "google", down)
+    app_metadata._memory_cache.clear()
+    assert app_metadata.get_app_info("google", "pkg", refresh=True)["title"] == "Good Title"
+
+    app_metadata._memory_cache.clear()  # next process reads the file
+    entry = app_metadata._read_entry("google", "pkg")
+    assert entry["title"] == "Good Title"
+    assert entry["failed_at"] > 0
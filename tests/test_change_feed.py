@@ -0,0 +1,49 @@
+import multiprocessing
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+import change_feed
+
+
+def _reviews(prefix: str, n: int) -> pd.DataFrame:
+    start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    return pd.DataFrame([
+        {"dt_utc": start + timedelta(minutes=i), "User Name": f"{prefix}{i}", "Review Note": "note", "Star": 5}
+        for i in range(n)
+    ])
+
+
+def _sync(feed_dir: str, prefix: str, rounds: int):
+    change_feed.FEED_DIR = feed_dir
+    change_feed._seen_cache.clear()
+    for r in range(rounds):
+        change_feed.append_new_reviews("google", "app", _reviews(f"{prefix}-{r}-", 20))
+
+
+@pytest.mark.skipif(change_feed.fcntl is None, reason="needs fork + flock")
+def test_concurrent_processes_never_overwrite_segments(tmp_path, monkeypatch):
+    monkeypatch.setattr(change_feed, "FEED_DIR", str(tmp_path))
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_sync, args=(str(tmp_path), f"p{i}", 5)) for i in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+
+    segments = list(change_feed.read_segments("google", "app"))
+    assert [n for n, _ in segments] == list(range(1, 21))
+    assert sum(len(df) for _, df in segments) == 4 * 5 * 20
+    assert change_feed.read_cursor("google", "app")["total"] == 400
+
+
+def test_seen_ids_are_read_incrementally(tmp_path, monkeypatch):
+    monkeypatch.setattr(change_feed, "FEED_DIR", str(tmp_path))
+    monkeypatch.setattr(change_feed, "_seen_cache", {})
+    assert change_feed.append_new_reviews("google", "app", _reviews("a", 3)) == 3
+    assert change_feed.append_new_reviews("google", "app", _reviews("a", 5)) == 2
+
+    change_feed._seen_cache.clear()  # a fresh process rebuilds from the file
+    assert change_feed.append_new_reviews("google", "app", _reviews("a", 5)) == 0
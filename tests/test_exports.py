@@ -0,0 +1,48 @@
+import gzip
+import io
+
+import pandas as pd
+import pytest
+
+from exports import EXPORT_FORMATS, iter_chunks, iter_combined_chunks, write_export
+from stores import TABLE_COLUMNS
+
+
+def _read(buf, fmt: str) -> pd.DataFrame:
+    data = buf.getvalue()
+    if fmt == "CSV (gzip)":
+        return pd.read_csv(io.BytesIO(gzip.decompress(data)))
+    if fmt == "CSV":
+        return pd.read_csv(io.BytesIO(data))
+    if fmt == "Parquet":
+        return pd.read_parquet(io.BytesIO(data))
+    return pd.read_excel(io.BytesIO(data), sheet_name="Reviews")
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_empty_filtered_export_keeps_header(fmt):
+    filtered = pd.DataFrame(columns=TABLE_COLUMNS)
+    out = _read(write_export(iter_chunks(filtered), fmt), fmt)
+    assert out.empty
+    assert list(out.columns) == TABLE_COLUMNS
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_empty_combined_export_keeps_header(fmt):
+    out = _read(write_export(iter_combined_chunks({"Google Play": pd.DataFrame(), "Amazon": None}), fmt), fmt)
+    assert out.empty
+    assert list(out.columns) == ["Store"] + TABLE_COLUMNS
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_no_chunks_still_writes_a_valid_file(fmt):
+    out = _read(write_export(iter([]), fmt), fmt)
+    assert list(out.columns) == TABLE_COLUMNS
+
+
+@pytest.mark.parametrize("fmt", list(EXPORT_FORMATS))
+def test_chunked_export_round_trips(fmt):
+    df = pd.DataFrame([["14 March, 2026 - 9:05 AM", "a", "nice", 5, "1.0", "English", "United States", "1"]] * 5, columns=TABLE_COLUMNS)
+    out = _read(write_export(iter_chunks(df, chunk_rows=2), fmt), fmt)
+    assert len(out) == 5
+    assert list(out["Star"]) == [5] * 5
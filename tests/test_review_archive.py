@@ -0,0 +1,29 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+import pytest
+
+import review_archive
+
+
+@pytest.fixture
+def archive(tmp_path, monkeypatch):
+    monkeypatch.setattr(review_archive, "ARCHIVE_DIR", str(tmp_path))
+    review_archive.archive_reviews("amazon", "B0TEST", pd.DataFrame([
+        {"dt_utc": datetime(2026, 3, 14, tzinfo=timezone.utc), "User Name": "a", "Review Note": "dated", "Star": 5},
+        {"dt_utc": None, "User Name": "b", "Review Note": "undated", "Star": 3},
+        {"dt_utc": datetime(2025, 1, 1, tzinfo=timezone.utc), "User Name": "c", "Review Note": "out of range", "Star": 1},
+    ]))
+    return tmp_path
+
+
+def test_undated_reviews_are_written_to_their_own_partition(archive):
+    assert (archive / "store=amazon" / "app=B0TEST" / f"month={review_archive.UNDATED_MONTH}").is_dir()
+
+
+def test_undated_reviews_are_excluded_unless_asked_for(archive):
+    start, end = datetime(2026, 3, 1, tzinfo=timezone.utc), datetime(2026, 3, 31, tzinfo=timezone.utc)
+    assert list(review_archive.query_archive("amazon", ["B0TEST"], start, end)["Review Note"]) == ["dated"]
+
+    df = review_archive.query_archive("amazon", ["B0TEST"], start, end, include_undated=True)
+    assert sorted(df["Review Note"]) == ["dated", "undated"]
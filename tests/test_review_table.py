@@ -0,0 +1,29 @@
+import io
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from review_table import filtered_export, review_table
+from stores import apply_filters
+
+
+def _raw():
+    return pd.DataFrame([
+        {"dt_utc": datetime(2026, 3, 14, tzinfo=timezone.utc), "User Name": "a", "Review Note": "Keeps crashing after the update", "Star": 1},
+        {"dt_utc": datetime(2026, 3, 15, tzinfo=timezone.utc), "User Name": "b", "Review Note": "Lovely", "Star": 5},
+    ])
+
+
+def test_review_table_tags_and_flags_without_touching_the_session_frame():
+    raw = _raw()
+    df = review_table(raw, collapse_dupes=False)
+    assert {"Themes", "Similar Reviews", "Review ID"} <= set(df.columns)
+    assert "Review ID" not in raw.columns
+    assert "Similar Reviews" not in review_table(raw).columns  # All Stores: no near-duplicate step
+
+
+def test_export_of_a_filter_with_no_matches_is_a_valid_file():
+    filtered = apply_filters(review_table(_raw(), collapse_dupes=False), [2], "", [], [])
+    assert filtered.empty
+    out = pd.read_csv(io.BytesIO(filtered_export(filtered, "CSV").getvalue()))
+    assert "Review Note" in out.columns
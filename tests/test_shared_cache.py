@@ -0,0 +1,51 @@
+import importlib
+import logging
+import os
+import pickle
+import time
+
+import pytest
+
+import shared_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(shared_cache, "SHARED_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(shared_cache, "SHARED_CACHE_URL", "")
+    return tmp_path
+
+
+def test_expiry_is_the_file_mtime(cache_dir):
+    shared_cache.cache_set(("k",), {"v": 1}, 60)
+    path = shared_cache._disk_path(shared_cache._key_digest(("k",)))
+    assert os.path.getmtime(path) == pytest.approx(time.time() + 60, abs=5)
+    assert shared_cache.cache_get(("k",)) == {"v": 1}
+
+
+def test_prune_stats_files_without_unpickling(cache_dir, monkeypatch):
+    shared_cache.cache_set(("fresh",), 1, 60)
+    shared_cache.cache_set(("old",), 2, 60)
+    old = shared_cache._disk_path(shared_cache._key_digest(("old",)))
+    os.utime(old, (time.time() - 1, time.time() - 1))
+
+    def no_unpickle(*args, **kwargs):
+        raise AssertionError("prune must not unpickle cache entries")
+
+    monkeypatch.setattr(pickle, "load", no_unpickle)
+    assert shared_cache.prune_disk_cache() == 1
+    assert not os.path.exists(old)
+
+
+def test_redis_url_without_redis_package_warns(monkeypatch, caplog):
+    real_find_spec = importlib.util.find_spec
+    monkeypatch.setenv("REVIEWS_CACHE_URL", "redis://localhost:6379/0")
+    monkeypatch.setattr(importlib.util, "find_spec", lambda name, *a: None if name == "redis" else real_find_spec(name, *a))
+    try:
+        with caplog.at_level(logging.WARNING, logger="shared_cache"):
+            importlib.reload(shared_cache)
+        assert shared_cache.SHARED_CACHE_URL == ""
+        assert "redis package is not installed" in caplog.text
+    finally:
+        monkeypatch.undo()
+        importlib.reload(shared_cache)
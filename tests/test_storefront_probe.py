@@ -0,0 +1,35 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import storefront_probe
+
+
+@pytest.fixture
+def probes(tmp_path, monkeypatch):
+    monkeypatch.setattr(storefront_probe, "PROBE_FILE", str(tmp_path / "probes.json"))
+    monkeypatch.setattr(storefront_probe, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(storefront_probe, "_probes", {})
+    probed = []
+
+    def probe(app_id, country, lang):
+        probed.append(country)
+        return datetime.now(timezone.utc)  # active again
+
+    monkeypatch.setitem(storefront_probe._PROBERS, "google", probe)
+    return probed
+
+
+def test_inactive_storefronts_are_skipped_without_reprobing_for_a_week(probes):
+    day_ago = time.time() - 24 * 3600
+    storefront_probe._probes.update({
+        "google:app:xx": {"newest": None, "probed_at": day_ago},  # never had a review
+        "google:app:yy": {"newest": "2020-01-01T00:00:00+00:00", "probed_at": day_ago},  # quiet, past PROBE_TTL
+    })
+    end = datetime.now(timezone.utc)
+    to_fetch, skipped = storefront_probe.plan_storefronts(
+        "google", "app", [("xx", "en", "X"), ("yy", "en", "Y")], end - timedelta(days=7), end
+    )
+    assert probes == ["yy"]
+    assert [s[0] for s in skipped] == ["xx"]
@@ -0,0 +1,78 @@
+from datetime import datetime, timezone
+
+import pandas as pd
+
+import stores
+from stores import format_datetime, standardize_table
+
+
+def _rows(*dates):
+    return pd.DataFrame([
+        {"dt_utc": d, "User Name": "", "Review Note": f"review {i}", "Star": 4}
+        for i, d in enumerate(dates)
+    ])
+
+
+def test_format_datetime_missing_values():
+    assert format_datetime(None) == ""
+    assert format_datetime(pd.NaT) == ""
+    assert format_datetime(datetime(2026, 3, 14, 9, 5, tzinfo=timezone.utc)) == "14 March, 2026 - 9:05 AM"
+
+
+def test_standardize_table_mixed_dated_and_undated_microsoft_rows():
+    df = standardize_table(_rows(datetime(2026, 3, 14, tzinfo=timezone.utc), None))
+    assert list(df["Date & Time"]) == ["14 March, 2026 - 12:00 AM", ""]
+    assert list(df["Review Note"]) == ["review 0", "review 1"]  # undated rows sort last
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, html: str):
+        self.content = html.encode("utf-8")
+
+
+def test_microsoft_reviews_without_a_date_still_render(monkeypatch):
+    html = (
+        '<div class="reviews">'
+        '<div class="review-card"><span>4 out of 5</span><span>3/14/2026</span><p>Works well</p></div>'
+        '<div class="review-card"><span>2 out of 5</span><p>No date on this one</p></div>'
+        "</div>"
+    )
+    monkeypatch.setattr(stores.requests, "get", lambda url, headers=None, timeout=None: _Response(html))
+
+    raw = stores.fetch_microsoft_reviews("9ABC", markets=[("en-us", "us")])
+    df = standardize_table(raw)
+    assert sorted(df["Date & Time"]) == ["", "14 March, 2026 - 12:00 AM"]
+
+
+def test_amazon_reviews_with_unparseable_date_still_render(monkeypatch):
+    html = (
+        '<div data-hook="review"><i data-hook="review-star-rating"><span>5.0 out of 5 stars</span></i>'
+        '<span data-hook="review-date">Reviewed in the United States on March 14, 2026</span>'
+        '<span data-hook="review-body">Great for kids</span></div>'
+        '<div data-hook="review"><i data-hook="review-star-rating"><span>3.0 out of 5 stars</span></i>'
+        '<span data-hook="review-date">Rezension aus Deutschland vom 14. März 2026</span>'
+        '<span data-hook="review-body">Gut</span></div>'
+    )
+    rows = stores._parse_amazon_page(html.encode("utf-8"))
+    monkeypatch.setattr(stores, "_fetch_amazon_page", lambda asin, page: (rows if page == 1 else [], False))
+
+    raw = stores.fetch_amazon_reviews(
+        "B000000000", datetime(2026, 3, 1, tzinfo=timezone.utc), datetime(2026, 3, 31, tzinfo=timezone.utc)
+    )
+    df = standardize_table(raw)
+    assert sorted(df["Date & Time"]) == ["", "14 March, 2026 - 12:00 AM"]
+
+
+def test_every_store_listing_merges_with_its_google_app():
+    # an app listed only outside Google Play would be fine, but today every listing has a Google twin
+    catalogs = {"apple": stores.APPLE_APPS, "microsoft": stores.MICROSOFT_APPS, "amazon": stores.AMAZON_APPS}
+    for category in stores.CATEGORIES:
+        identities = stores.app_identities(category)
+        for store, catalog in catalogs.items():
+            for label, app_id in catalog.get(category, {}).items():
+                merged = [ids for ids in identities.values() if ids.get(store) == app_id]
+                assert merged and "google" in merged[0], f"{store} {label!r} is not merged with a Google app"
+
+    assert stores.app_identities("Applications")["Alarm Clock: Mornings & Naps"]["apple"] == "450993079"
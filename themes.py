@@ -0,0 +1,92 @@
+import re
+
+import pandas as pd
+
+
+# ==========================================================
+# OFFLINE THEME TAGGING
+# ==========================================================
+
+# Word prefixes per theme. Matched at word starts, case-insensitive.
+# A trailing space marks a whole word: "ad " matches "ad" (even last in the review), not "add".
+THEME_KEYWORDS = {
+    "Crash": [
+        "crash", "freez", "froze", "stuck", "black screen", "white screen", "won't open", "wont open",
+        "doesn't open", "doesnt open", "not open", "not working", "closes", "shuts down", "bug", "glitch",
+    ],
+    "Ads": [
+        "ads", "ad ", "advert", "commercial", "too many ad", "pop up", "popup", "pop-up",
+    ],
+    "Payment": [
+        "pay", "paid", "purchase", "subscription", "subscribe", "refund", "charge", "money",
+        "price", "expensive", "premium", "unlock", "trial", "billing", "cancel",
+    ],
+    "Language": [
+        "language", "translat", "english", "spanish", "french", "german", "arabic", "hindi",
+        "pronunc", "accent", "voice",
+    ],
+    "Performance": [
+        "slow", "lag", "loading", "battery", "heat", "storage", "takes forever",
+    ],
+    "Sound": [
+        "sound", "volume", "music", "audio", "mute", "loud",
+    ],
+}
+
+MAX_CACHED_TAGS = 500_000
+
+# tags per review id; each review is tagged once per process
+_TAG_CACHE = {}
+
+
+def _keyword_pattern(keyword: str) -> str:
+    return re.escape(keyword.rstrip()) + (r"\b" if keyword.endswith(" ") else "")
+
+
+_THEME_PATTERNS = {
+    theme: r"\b(?:" + "|".join(_keyword_pattern(k) for k in keywords) + ")"
+    for theme, keywords in THEME_KEYWORDS.items()
+}
+
+
+def _tag_notes(notes: pd.Series) -> pd.Series:
+    notes = notes.fillna("").astype(str).str.lower()
+    tags = pd.Series("", index=notes.index)
+    for theme, pattern in _THEME_PATTERNS.items():
+        hit = notes.str.contains(pattern, regex=True)
+        tags = tags.mask(hit, tags + ", " + theme)
+    return tags.str.lstrip(", ")
+
+
+def tag_reviews(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty or "Review ID" not in df.columns:
+        return df
+
+    ids = df["Review ID"]
+    new = ~ids.map(lambda i: i in _TAG_CACHE).astype(bool)
+    if new.any():
+        if len(_TAG_CACHE) + int(new.sum()) > MAX_CACHED_TAGS:
+            _TAG_CACHE.clear()
+            new = pd.Series(True, index=ids.index)
+        batch = df.loc[new].drop_duplicates(subset=["Review ID"])
+        _TAG_CACHE.update(zip(batch["Review ID"], _tag_notes(batch["Review Note"])))
+
+    return df.assign(Themes=[_TAG_CACHE.get(i, "") for i in ids])
+
+
+def theme_counts(df: pd.DataFrame) -> dict:
+    counts = {theme: 0 for theme in THEME_KEYWORDS}
+    if df.empty or "Themes" not in df.columns:
+        return counts
+    exploded = df["Themes"].str.split(", ").explode()
+    vc = exploded[exploded != ""].value_counts().to_dict()
+    for theme in counts.keys():
+        counts[theme] = int(vc.get(theme, 0))
+    return counts
+
+
+def filter_by_themes(df: pd.DataFrame, themes) -> pd.DataFrame:
+    if df.empty or not themes or "Themes" not in df.columns:
+        return df
+    pattern = r"(?:^|, )(?:" + "|".join(re.escape(t) for t in themes) + r")(?:,|$)"
+    return df[df["Themes"].str.contains(pattern, regex=True)]
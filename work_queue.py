@@ -0,0 +1,267 @@
+import argparse
+import os
+import socket
+import sqlite3
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from stores import (
+    DATA_DIR,
+    CATEGORIES,
+    GOOGLE_APPS,
+    APPLE_APPS,
+    GOOGLE_ALL_STOREFRONTS,
+    FetchError,
+    is_incomplete,
+    parse_date_range,
+    fetch_google_reviews_date_range,
+    fetch_apple_reviews_country,
+)
+from shared_cache import cache_set, fetch_key, fetch_ttl
+from review_archive import archive_reviews
+
+
+# ==========================================================
+# STOREFRONT WORK QUEUE (SQLite, leased tasks)
+# ==========================================================
+#
+# One task = one (store, app, storefront, date range) fetch. Any number of
+# `python work_queue.py worker` processes lease tasks from the same database
+# file. Point REVIEWS_QUEUE_DB at a path every worker can reach; SQLite needs
+# working file locks, so prefer a local disk or a volume that supports them.
+# Results are published to the shared fetch cache and the review archive; the
+# queue itself only keeps status and row counts.
+
+QUEUE_DB = os.environ.get("REVIEWS_QUEUE_DB", os.path.join(DATA_DIR, "work_queue.sqlite3"))
+
+LEASE_SECONDS = 10 * 60
+MAX_ATTEMPTS = 5
+RETRY_BASE_SECONDS = 30
+IDLE_POLL_SECONDS = 5
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id           TEXT PRIMARY KEY,
+    store        TEXT NOT NULL,
+    app_id       TEXT NOT NULL,
+    country      TEXT NOT NULL,
+    lang         TEXT NOT NULL,
+    start_dt     TEXT NOT NULL,
+    end_dt       TEXT NOT NULL,
+    status       TEXT NOT NULL DEFAULT 'queued',
+    attempts     INTEGER NOT NULL DEFAULT 0,
+    lease_owner  TEXT,
+    lease_until  REAL,
+    available_at REAL NOT NULL,
+    rows         INTEGER,
+    error        TEXT,
+    updated_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (status, available_at);
+"""
+
+_FETCHERS = {
+    "google": lambda t: fetch_google_reviews_date_range(t["app_id"], t["start"], t["end"], t["lang"], t["country"]),
+    "apple": lambda t: fetch_apple_reviews_country(t["app_id"], t["country"], t["start"], t["end"]),
+}
+
+
+def _connect():
+    os.makedirs(os.path.dirname(os.path.abspath(QUEUE_DB)), exist_ok=True)
+    conn = sqlite3.connect(QUEUE_DB, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def task_id(store: str, app_id: str, country: str, start_dt: datetime, end_dt: datetime) -> str:
+    return f"{store}:{app_id}:{country}:{start_dt.isoformat()}:{end_dt.isoformat()}"
+
+
+def enqueue_task(conn, store: str, app_id: str, country: str, lang: str, start_dt: datetime, end_dt: datetime, requeue_done: bool = False):
+    tid = task_id(store, app_id, country, start_dt, end_dt)
+    now = time.time()
+    conn.execute(
+        "INSERT OR IGNORE INTO tasks (id, store, app_id, country, lang, start_dt, end_dt, available_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (tid, store, str(app_id), country, lang, start_dt.isoformat(), end_dt.isoformat(), now, now),
+    )
+    if requeue_done:
+        conn.execute(
+            "UPDATE tasks SET status = 'queued', attempts = 0, available_at = ?, updated_at = ? "
+            "WHERE id = ? AND status IN ('done', 'failed')",
+            (now, now, tid),
+        )
+    return tid
+
+
+def enqueue_catalog(stores, categories, start_dt: datetime, end_dt: datetime, countries=None, requeue_done: bool = False) -> int:
+    catalogs = {"google": GOOGLE_APPS, "apple": APPLE_APPS}
+    storefronts = [s for s in GOOGLE_ALL_STOREFRONTS if not countries or s[0] in countries]
+
+    conn = _connect()
+    count = 0
+    conn.execute("BEGIN")
+    for store in stores:
+        for category in categories:
+            for app_id in catalogs[store].get(category, {}).values():
+                for country_code, lang_code, _ in storefronts:
+                    enqueue_task(conn, store, app_id, country_code, lang_code, start_dt, end_dt, requeue_done)
+                    count += 1
+    conn.execute("COMMIT")
+    conn.close()
+    return count
+
+
+def lease_task(conn, worker_id: str):
+    now = time.time()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # a lease that keeps expiring means the task crashes or hangs its worker: stop handing it out
+        conn.execute(
+            "UPDATE tasks SET status = 'failed', error = 'lease expired on every attempt', lease_owner = NULL, updated_at = ? "
+            "WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+            (now, now, MAX_ATTEMPTS),
+        )
+        row = conn.execute(
+            "SELECT * FROM tasks "
+            "WHERE (status = 'queued' AND available_at <= ?) OR (status = 'leased' AND lease_until < ?) "
+            "ORDER BY available_at LIMIT 1",
+            (now, now),
+        ).fetchone()
+        if row is None:
+            conn.execute("COMMIT")
+            return None
+        conn.execute(
+            "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+            "WHERE id = ?",
+            (worker_id, now + LEASE_SECONDS, now, row["id"]),
+        )
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return dict(row, attempts=row["attempts"] + 1)
+
+
+# both only touch a task this worker still holds; if the lease expired and another
+# worker took it over, that worker's outcome wins
+
+def complete_task(conn, task, worker_id: str, df: pd.DataFrame):
+    conn.execute(
+        "UPDATE tasks SET status = 'done', rows = ?, error = NULL, lease_owner = NULL, updated_at = ? "
+        "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+        (len(df), time.time(), task["id"], worker_id),
+    )
+
+
+def fail_task(conn, task, worker_id: str, error: str):
+    now = time.time()
+    if task["attempts"] >= MAX_ATTEMPTS:
+        conn.execute(
+            "UPDATE tasks SET status = 'failed', error = ?, lease_owner = NULL, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (error[:500], now, task["id"], worker_id),
+        )
+    else:
+        conn.execute(
+            "UPDATE tasks SET status = 'queued', error = ?, lease_owner = NULL, available_at = ?, updated_at = ? "
+            "WHERE id = ? AND status = 'leased' AND lease_owner = ?",
+            (error[:500], now + RETRY_BASE_SECONDS * 2 ** (task["attempts"] - 1), now, task["id"], worker_id),
+        )
+
+
+def run_task(task) -> pd.DataFrame:
+    t = {
+        "app_id": task["app_id"],
+        "country": task["country"],
+        "lang": task["lang"],
+        "start": datetime.fromisoformat(task["start_dt"]),
+        "end": datetime.fromisoformat(task["end_dt"]),
+    }
+    df = _FETCHERS[task["store"]](t)
+    if is_incomplete(df):
+        raise FetchError("some pages failed")  # retry later instead of storing a partial result
+
+    # publish where the UI and other replicas look first
+    cache_set(fetch_key(task["store"], task["app_id"], task["country"], t["start"], t["end"]), df, fetch_ttl(t["end"]))
+    archive_reviews(task["store"], task["app_id"], df)
+    return df
+
+
+def run_worker(worker_id: str = "", exit_when_idle: bool = False) -> int:
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    conn = _connect()
+    done = 0
+
+    while True:
+        task = lease_task(conn, worker_id)
+        if task is None:
+            if exit_when_idle:
+                break
+            time.sleep(IDLE_POLL_SECONDS)
+            continue
+
+        try:
+            df = run_task(task)
+        except Exception as e:
+            fail_task(conn, task, worker_id, f"{type(e).__name__}: {e}")
+            continue
+
+        complete_task(conn, task, worker_id, df)
+        done += 1
+
+    conn.close()
+    return done
+
+
+def queue_status():
+    conn = _connect()
+    rows = conn.execute("SELECT status, COUNT(*) AS n FROM tasks GROUP BY status").fetchall()
+    conn.close()
+    return {r["status"]: r["n"] for r in rows}
+
+
+def day_range(days_back: int):
+    # same boundaries as the UI date picker, so results land under the keys app.py looks up
+    today = datetime.now(timezone.utc).date()
+    start_dt, end_dt, _, _ = parse_date_range((today - timedelta(days=days_back), today))
+    return start_dt, end_dt
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed storefront fetch queue.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    enq = sub.add_parser("enqueue", help="Queue one task per app x storefront.")
+    enq.add_argument("--store", choices=["google", "apple", "all"], default="all")
+    enq.add_argument("--category", action="append", choices=CATEGORIES, help="Repeatable. Default: all categories.")
+    enq.add_argument("--countries", default="", help="Comma separated country codes. Default: all storefronts.")
+    enq.add_argument("--days", type=int, default=7, help="Range: this many days back through today (UTC).")
+    enq.add_argument("--requeue", action="store_true", help="Run again even if the same range already finished.")
+
+    wrk = sub.add_parser("worker", help="Lease and run tasks until stopped.")
+    wrk.add_argument("--id", default="", help="Worker id. Default: host-pid.")
+    wrk.add_argument("--exit-when-idle", action="store_true")
+
+    sub.add_parser("status", help="Task counts by status.")
+
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        stores = ["google", "apple"] if args.store == "all" else [args.store]
+        countries = {c.strip().lower() for c in args.countries.split(",") if c.strip()}
+        start_dt, end_dt = day_range(args.days)
+        n = enqueue_catalog(stores, args.category or CATEGORIES, start_dt, end_dt, countries, args.requeue)
+        print(f"Queued {n} tasks for {start_dt:%Y-%m-%d} → {end_dt:%Y-%m-%d}.")
+    elif args.command == "worker":
+        print(f"Worker finished {run_worker(args.id, args.exit_when_idle)} tasks.")
+    else:
+        print(queue_status())
+
+
+if __name__ == "__main__":
+    main()